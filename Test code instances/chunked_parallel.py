@@ -11,17 +11,23 @@ from pathlib import Path
 import logging
 from typing import Optional, List, Tuple
 import time
-import tempfile
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import io
+import math
+import atexit
+import zipfile
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import functools
 
 try:
     from pdf2docx import Converter
     from docx import Document
-    from docx.shared import Inches
-    from docx.oxml.shared import OxmlElement, qn
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+    from lxml import etree
 except ImportError as e:
     print(f"Missing required packages. Install with:")
     print("pip install pdf2docx python-docx openpyxl")
@@ -31,21 +37,141 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Compiled WordprocessingML queries used to read table text straight from the XML
+W_NS = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+_TABLE_ROWS = etree.XPath('./w:tr', namespaces=W_NS)
+_ROW_CELLS = etree.XPath('./w:tc', namespaces=W_NS)
+_CELL_PARAGRAPHS = etree.XPath('./w:p', namespaces=W_NS)
+_PARAGRAPH_RUN_CONTENT = etree.XPath('.//w:r/w:t | .//w:r/w:br | .//w:r/w:cr | .//w:r/w:tab', namespaces=W_NS)
+_CELL_SPAN = etree.XPath('string(./w:tcPr/w:gridSpan/@w:val)', namespaces=W_NS)
+_CELL_VMERGE = etree.XPath('./w:tcPr/w:vMerge', namespaces=W_NS)
+_ROW_GRID_BEFORE = etree.XPath('string(./w:trPr/w:gridBefore/@w:val)', namespaces=W_NS)
+_GRID_COLUMNS = etree.XPath('count(./w:tblGrid/w:gridCol)', namespaces=W_NS)
+W_TBL = f"{{{W_NS['w']}}}tbl"
+W_BODY = f"{{{W_NS['w']}}}body"
+W_VAL = f"{{{W_NS['w']}}}val"
+W_T = f"{{{W_NS['w']}}}t"
+W_TAB = f"{{{W_NS['w']}}}tab"
+W_TYPE = f"{{{W_NS['w']}}}type"
+
+# Per-process cache of opened converters, keyed by (path, mtime) so every
+# chunk a worker handles reuses the same parsed PDF instead of re-opening it
+_CONVERTER_CACHE = {}
+
+def _close_cached_converters():
+    """Close any converters still held by this process"""
+    for cv in _CONVERTER_CACHE.values():
+        try:
+            cv.close()
+        except Exception:
+            pass
+    _CONVERTER_CACHE.clear()
+
+atexit.register(_close_cached_converters)
+
+def get_cached_converter(pdf_path: Path):
+    """Return a Converter for pdf_path, opening the PDF only once per process"""
+    key = (str(pdf_path), pdf_path.stat().st_mtime_ns)
+    cv = _CONVERTER_CACHE.get(key)
+    if cv is None:
+        cv = Converter(str(pdf_path))
+        _CONVERTER_CACHE[key] = cv
+    return cv
+
+def count_docx_tables(docx_file) -> int:
+    """Count top-level tables by streaming document.xml instead of building a python-docx tree
+    
+    Accepts a path or a binary file-like object. Nested tables are not counted,
+    matching what the Excel conversion extracts.
+    """
+    return sum(1 for _ in iter_docx_tables(docx_file))
+
+@functools.lru_cache(maxsize=64)
+def _cached_page_count(pdf_path: str, mtime_ns: int) -> int:
+    """Page count for a PDF, cached per (path, mtime) so unchanged files are opened once"""
+    import fitz
+    doc = fitz.open(pdf_path)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+def paragraph_text(p) -> str:
+    """Text of a <w:p> element, with line breaks and tabs rendered like python-docx"""
+    parts = []
+    for item in _PARAGRAPH_RUN_CONTENT(p):
+        if item.tag == W_T:
+            parts.append(item.text or '')
+        elif item.tag == W_TAB:
+            parts.append('\t')
+        elif item.get(W_TYPE) not in ('page', 'column'):
+            parts.append('\n')
+    return ''.join(parts)
+
+def table_rows_text(tbl) -> List[List[str]]:
+    """Extract stripped cell text for every row of a <w:tbl> element
+    
+    Merged cells repeat their text across the spanned columns and rows,
+    matching the grid python-docx's row.cells produces.
+    """
+    # Cells are placed by grid column (w:gridBefore plus the spans to their left), so a
+    # vertical merge continuation reuses the text of the cell above at the same column
+    rows = []
+    above = {}
+    for tr in _TABLE_ROWS(tbl):
+        row_values = []
+        current = {}
+        grid_before = _ROW_GRID_BEFORE(tr)
+        grid_offset = int(grid_before) if grid_before else 0
+        for tc in _ROW_CELLS(tr):
+            span = _CELL_SPAN(tc)
+            span = int(span) if span else 1
+            vmerge = _CELL_VMERGE(tc)
+            if vmerge and vmerge[0].get(W_VAL, 'continue') == 'continue' and grid_offset in above:
+                # Continuation of a vertical merge: reuse the text above
+                text, span = above[grid_offset]
+            else:
+                text = '\n'.join(paragraph_text(p) for p in _CELL_PARAGRAPHS(tc)).strip()
+            current[grid_offset] = (text, span)
+            row_values.extend([text] * span)
+            grid_offset += span
+        rows.append(row_values)
+        above = current
+    return rows
+
+def iter_docx_tables(docx_path):
+    """Stream the top-level <w:tbl> elements of a DOCX one at a time
+    
+    Each table is freed once the caller moves on, so peak memory is one
+    table rather than the whole document tree.
+    """
+    with zipfile.ZipFile(docx_path) as docx_zip, docx_zip.open('word/document.xml') as document_xml:
+        for _, tbl in etree.iterparse(document_xml, tag=W_TBL):
+            # Nested tables are read as part of their enclosing table
+            if tbl.getparent().tag != W_BODY:
+                continue
+            yield tbl
+            tbl.clear()
+            while tbl.getprevious() is not None:
+                del tbl.getparent()[0]
+
 def convert_pdf_chunk_worker(args):
     """Worker function for parallel chunk conversion"""
-    pdf_path, start_page, end_page, chunk_number, chunks_folder = args
-    
-    chunk_docx_path = chunks_folder / f"{pdf_path.stem}_chunk_{chunk_number}.docx"
+    pdf_path, start_page, end_page, chunk_number = args
     
     try:
         logger.info(f"🔄 Worker {chunk_number}: Processing pages {start_page + 1}-{end_page}")
         
-        # Convert specific page range
-        cv = Converter(str(pdf_path))
+        # Convert specific page range (converter stays open for later chunks)
+        # and write the chunk DOCX to memory instead of a temp file
+        cv = get_cached_converter(pdf_path)
+        chunk_buffer = io.BytesIO()
         cv.convert(
-            str(chunk_docx_path),
+            chunk_buffer,
             start=start_page,
             end=end_page,  # Fixed indexing - include end page
+            # Parallelism comes from the chunk pool; keep pdf2docx single-process
+            multi_processing=False,
             # Optimized settings for speed while preserving quality
             table_settings={
                 'snap_tolerance': 1.0,
@@ -53,18 +179,18 @@ def convert_pdf_chunk_worker(args):
                 'join_tolerance': 1.0,
             }
         )
-        cv.close()
+        
+        docx_bytes = chunk_buffer.getvalue()
         
         # Verify chunk
-        chunk_doc = Document(str(chunk_docx_path))
-        chunk_tables = len(chunk_doc.tables)
+        chunk_tables = count_docx_tables(io.BytesIO(docx_bytes))
         expected_tables = (end_page - start_page) * 4
         
         logger.info(f"✅ Worker {chunk_number}: Completed with {chunk_tables}/{expected_tables} tables")
         
         return {
             'chunk_number': chunk_number,
-            'chunk_path': chunk_docx_path,
+            'docx_bytes': docx_bytes,
             'table_count': chunk_tables,
             'expected_tables': expected_tables,
             'success': True,
@@ -74,9 +200,15 @@ def convert_pdf_chunk_worker(args):
         
     except Exception as e:
         logger.error(f"❌ Worker {chunk_number} failed: {e}")
+        # Don't reuse a converter that may have been left half-parsed
+        for key in [k for k in _CONVERTER_CACHE if k[0] == str(pdf_path)]:
+            try:
+                _CONVERTER_CACHE.pop(key).close()
+            except Exception:
+                pass
         return {
             'chunk_number': chunk_number,
-            'chunk_path': None,
+            'docx_bytes': None,
             'table_count': 0,
             'expected_tables': 0,
             'success': False,
@@ -88,22 +220,30 @@ def convert_pdf_chunk_worker(args):
 class ParallelChunkedConverter:
     """Ultimate converter: chunking + parallel processing for maximum speed"""
     
+    # Shared style objects, reused for every styled cell on every sheet
+    BOLD = Font(bold=True)
+    TITLE_FONT = Font(size=16, bold=True)
+    HEADER_FILL = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+    
     def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data", 
                  chunk_size: int = 6, max_workers: Optional[int] = None):
         self.input_folder = Path(input_folder)
         self.output_folder = Path(output_folder)
         self.docx_folder = self.output_folder / "converted_docx"
-        self.chunks_folder = self.output_folder / "temp_chunks"
         
         # Create necessary folders
         self.output_folder.mkdir(exist_ok=True)
         self.docx_folder.mkdir(exist_ok=True)
-        self.chunks_folder.mkdir(exist_ok=True)
         
         # Processing configuration
         self.chunk_size = chunk_size
         self.max_workers = max_workers or min(multiprocessing.cpu_count(), 4)  # Limit to 4 for stability
         
+        # One native thread per worker process, so N workers don't each spin up
+        # a full BLAS/OpenMP pool and oversubscribe the cores (inherited by spawn)
+        for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ.setdefault(var, "1")
+        
         logger.info(f"🚀 Configured for parallel processing:")
         logger.info(f"  • Chunk size: {chunk_size} pages")
         logger.info(f"  • Max workers: {self.max_workers}")
@@ -135,52 +275,77 @@ class ParallelChunkedConverter:
         print(f"📁 Found {len(pdf_files)} PDF files and {len(docx_files)} DOCX files")
         print(f"⚡ Parallel chunked processing: {self.chunk_size} pages × {self.max_workers} workers")
         
-        # Process PDF files with parallel chunking
-        for pdf_file in pdf_files:
-            start_time = time.time()
-            logger.info(f"🚀 Processing PDF with parallel chunking: {pdf_file.name}")
-            
-            docx_path = self.parallel_chunked_convert(pdf_file)
-            if docx_path:
-                self.convert_docx_to_excel(docx_path, source_type="PDF_PARALLEL_CHUNKED")
-            
-            elapsed_time = time.time() - start_time
-            print(f"⏱️ Total parallel processing time: {elapsed_time:.2f} seconds")
+        # Excel extraction runs on a background thread so it overlaps with
+        # the next PDF's parallel conversion
+        excel_queue = queue.Queue()
+        excel_thread = threading.Thread(target=self.excel_worker, args=(excel_queue,))
+        excel_thread.start()
         
-        # Process existing DOCX files
-        for docx_file in docx_files:
+        try:
+            # Process PDF files with parallel chunking
+            for pdf_file in pdf_files:
+                start_time = time.time()
+                logger.info(f"🚀 Processing PDF with parallel chunking: {pdf_file.name}")
+                
+                docx_path, chunk_size = self.parallel_chunked_convert(pdf_file)
+                if docx_path:
+                    excel_queue.put((docx_path, "PDF_PARALLEL_CHUNKED", chunk_size))
+                
+                elapsed_time = time.time() - start_time
+                print(f"⏱️ Parallel conversion time: {elapsed_time:.2f} seconds")
+            
+            # Process existing DOCX files
+            for docx_file in docx_files:
+                logger.info(f"📊 Queueing DOCX: {docx_file.name}")
+                excel_queue.put((docx_file, "DOCX", None))
+        finally:
+            # Sentinel: let the Excel thread drain the queue and exit
+            excel_queue.put(None)
+            excel_thread.join()
+
+    def excel_worker(self, excel_queue: queue.Queue):
+        """Convert queued DOCX files to Excel until the None sentinel arrives"""
+        while True:
+            job = excel_queue.get()
+            if job is None:
+                break
+            
+            docx_path, source_type, chunk_size = job
             start_time = time.time()
-            logger.info(f"📊 Processing DOCX: {docx_file.name}")
             
-            self.convert_docx_to_excel(docx_file, source_type="DOCX")
+            self.convert_docx_to_excel(docx_path, source_type=source_type, chunk_size=chunk_size)
             
             elapsed_time = time.time() - start_time
-            print(f"⏱️ DOCX processing time: {elapsed_time:.2f} seconds")
-        
-        # Cleanup temp files
-        self.cleanup_temp_files()
+            print(f"⏱️ Excel extraction time for {docx_path.name}: {elapsed_time:.2f} seconds")
 
-    def parallel_chunked_convert(self, pdf_path: Path) -> Optional[Path]:
-        """Convert PDF using parallel chunking for maximum speed"""
+    def parallel_chunked_convert(self, pdf_path: Path) -> Tuple[Optional[Path], Optional[int]]:
+        """Convert PDF using parallel chunking for maximum speed
+        
+        Returns the DOCX path (None on failure) and the chunk size actually used
+        (None when an existing DOCX was reused).
+        """
         docx_path = self.docx_folder / f"{pdf_path.stem}.docx"
         
         if docx_path.exists():
             logger.info(f"📁 DOCX already exists: {docx_path.name}")
-            return docx_path
+            return docx_path, None
         
         try:
             # Determine total pages
             total_pages = self.get_pdf_page_count(pdf_path)
             logger.info(f"📄 PDF has {total_pages} pages")
             
+            chunk_size = self.choose_chunk_size(total_pages)
+            logger.info(f"📐 Using chunk size of {chunk_size} pages (upper bound {self.chunk_size})")
+            
             # Create chunk specifications
             chunk_specs = []
-            for chunk_start in range(0, total_pages, self.chunk_size):
-                chunk_end = min(chunk_start + self.chunk_size, total_pages)
-                chunk_number = (chunk_start // self.chunk_size) + 1
+            for chunk_start in range(0, total_pages, chunk_size):
+                chunk_end = min(chunk_start + chunk_size, total_pages)
+                chunk_number = (chunk_start // chunk_size) + 1
                 
                 chunk_specs.append((
-                    pdf_path, chunk_start, chunk_end, chunk_number, self.chunks_folder
+                    pdf_path, chunk_start, chunk_end, chunk_number
                 ))
             
             logger.info(f"🔀 Created {len(chunk_specs)} chunks for parallel processing")
@@ -191,29 +356,37 @@ class ParallelChunkedConverter:
             logger.info(f"⚡ Starting parallel conversion with {self.max_workers} workers...")
             
             chunk_results = []
-            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all chunk conversion jobs
-                future_to_chunk = {
-                    executor.submit(convert_pdf_chunk_worker, chunk_spec): chunk_spec[3] 
-                    for chunk_spec in chunk_specs
-                }
-                
-                # Collect results as they complete
-                for future in as_completed(future_to_chunk):
-                    chunk_number = future_to_chunk[future]
-                    try:
-                        result = future.result()
+            # Batch task dispatch so small chunks don't pay one IPC round-trip each
+            dispatch_chunksize = max(1, len(chunk_specs) // (self.max_workers + 2))
+            # Spawned workers behave the same on every platform. Workers are not recycled:
+            # max_tasks_per_child deadlocks executor.map on 3.11 once batches outnumber
+            # workers, and each worker's converter cache is meant to last the whole PDF
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                # Results come back in submission order
+                try:
+                    for result in executor.map(convert_pdf_chunk_worker, chunk_specs,
+                                               chunksize=dispatch_chunksize):
                         chunk_results.append(result)
+                        chunk_number = result['chunk_number']
                         
                         if result['success']:
-                            logger.info(f"✅ Chunk {chunk_number} completed successfully")
+                            logger.info(f"✅ Chunk {chunk_number} completed successfully "
+                                        f"({len(chunk_results)}/{len(chunk_specs)})")
                         else:
                             logger.error(f"❌ Chunk {chunk_number} failed: {result.get('error', 'Unknown error')}")
                             
-                    except Exception as e:
-                        logger.error(f"❌ Chunk {chunk_number} failed with exception: {e}")
+                except (BrokenProcessPool, MemoryError) as e:
+                    # A worker died (e.g. OOM-killed): the run is doomed, so stop
+                    # the remaining workers instead of letting them keep allocating
+                    logger.error(f"❌ Worker pool failed irrecoverably: {e!r}")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ Parallel chunk conversion failed with exception: {e}")
+                    for chunk_spec in chunk_specs[len(chunk_results):]:
                         chunk_results.append({
-                            'chunk_number': chunk_number,
+                            'chunk_number': chunk_spec[3],
                             'success': False,
                             'error': str(e)
                         })
@@ -221,13 +394,12 @@ class ParallelChunkedConverter:
             parallel_time = time.time() - conversion_start
             logger.info(f"⚡ Parallel conversion completed in {parallel_time:.2f} seconds")
             
-            # Sort results by chunk number and filter successful ones
+            # executor.map already yields results in chunk order
             successful_chunks = [r for r in chunk_results if r['success']]
-            successful_chunks.sort(key=lambda x: x['chunk_number'])
             
             if not successful_chunks:
                 logger.error("❌ No chunks were successfully processed")
-                return None
+                return None, None
             
             failed_chunks = [r for r in chunk_results if not r['success']]
             if failed_chunks:
@@ -235,13 +407,12 @@ class ParallelChunkedConverter:
             
             # Combine successful chunks
             logger.info(f"🔗 Combining {len(successful_chunks)} successful chunks...")
-            chunk_paths = [result['chunk_path'] for result in successful_chunks]
-            final_docx = self.combine_chunks(chunk_paths, docx_path)
+            chunk_docs = [result['docx_bytes'] for result in successful_chunks]
+            final_docx = self.combine_chunks(chunk_docs, docx_path)
             
             if final_docx:
                 # Verify final result
-                final_doc = Document(str(final_docx))
-                final_tables = len(final_doc.tables)
+                final_tables = count_docx_tables(final_docx)
                 expected_total = sum(r['expected_tables'] for r in successful_chunks)
                 
                 logger.info(f"📊 Final verification: {final_tables}/{expected_total} tables")
@@ -257,61 +428,63 @@ class ParallelChunkedConverter:
                 print(f"  Total time: {total_time:.2f}s")
                 print(f"  Speed improvement: {((167.19 - total_time) / 167.19 * 100):.1f}% vs sequential chunking")
                 
-                return final_docx
+                return final_docx, chunk_size
             else:
                 logger.error("❌ Failed to combine chunks")
-                return None
+                return None, None
             
         except Exception as e:
             logger.error(f"❌ Parallel chunked conversion failed for {pdf_path.name}: {e}")
-            return None
+            return None, None
+
+    def choose_chunk_size(self, total_pages: int) -> int:
+        """Pick a chunk size giving roughly two chunks per worker
+        
+        A single trailing chunk would otherwise leave the remaining workers idle;
+        the configured chunk_size is kept as an upper bound.
+        """
+        balanced = math.ceil(total_pages / (self.max_workers * 2))
+        return min(self.chunk_size, max(2, balanced))
 
     def get_pdf_page_count(self, pdf_path: Path) -> int:
-        """Get the total number of pages in PDF"""
-        try:
-            import fitz
-            doc = fitz.open(str(pdf_path))
-            page_count = len(doc)
-            doc.close()
-            return page_count
-        except ImportError:
-            logger.warning("PyMuPDF not available, assuming 24 pages")
-            return 24
-        except Exception as e:
-            logger.warning(f"Could not get page count, assuming 24 pages: {e}")
-            return 24
+        """Get the total number of pages in PDF
+        
+        Raises if PyMuPDF is missing or the PDF can't be opened, rather than
+        guessing a page count and silently converting the wrong range.
+        """
+        return _cached_page_count(str(pdf_path), pdf_path.stat().st_mtime_ns)
 
-    def combine_chunks(self, chunk_paths: List[Path], output_path: Path) -> Optional[Path]:
-        """Combine chunks efficiently (reusing proven method)"""
+    def combine_chunks(self, chunk_docs: List[bytes], output_path: Path) -> Optional[Path]:
+        """Combine in-memory chunk DOCX files efficiently (reusing proven method)"""
         try:
-            if not chunk_paths:
+            if not chunk_docs:
                 return None
             
-            logger.info(f"🔗 Combining {len(chunk_paths)} chunks...")
+            # A single chunk is already the finished document
+            if len(chunk_docs) == 1:
+                output_path.write_bytes(chunk_docs[0])
+                logger.info("✅ Single chunk written directly, no combining needed")
+                return output_path
+            
+            logger.info(f"🔗 Combining {len(chunk_docs)} chunks...")
             
             # Start with first chunk
-            import shutil
-            shutil.copy2(chunk_paths[0], output_path)
-            combined_doc = Document(str(output_path))
+            combined_doc = Document(io.BytesIO(chunk_docs[0]))
             
+            combined_body = combined_doc.element.body
             total_tables = len(combined_doc.tables)
             
             # Append remaining chunks
-            for i, chunk_path in enumerate(chunk_paths[1:], 1):
-                chunk_doc = Document(str(chunk_path))
+            for i, chunk_bytes in enumerate(chunk_docs[1:], 1):
+                chunk_doc = Document(io.BytesIO(chunk_bytes))
                 chunk_tables = len(chunk_doc.tables)
                 
                 # Add page break
                 combined_doc.add_page_break()
                 
-                # Copy all elements from chunk
-                for element in chunk_doc.element.body:
-                    try:
-                        import copy
-                        imported = copy.deepcopy(element)
-                        combined_doc.element.body.append(imported)
-                    except:
-                        pass
+                # Move all elements from chunk; chunk_doc is discarded afterwards,
+                # so its nodes can be adopted without copying
+                combined_body.extend(list(chunk_doc.element.body))
                 
                 total_tables += chunk_tables
                 logger.info(f"  Added chunk {i + 1}: {chunk_tables} tables")
@@ -319,43 +492,33 @@ class ParallelChunkedConverter:
             # Save combined document
             combined_doc.save(str(output_path))
             
-            # Verify result
-            verification_doc = Document(str(output_path))
-            final_count = len(verification_doc.tables)
-            
-            logger.info(f"✅ Combined document: {final_count} tables")
+            logger.info(f"✅ Combined document: {total_tables} tables")
             return output_path
             
         except Exception as e:
             logger.error(f"Chunk combination failed: {e}")
             # Fallback: use first chunk
-            if chunk_paths:
-                shutil.copy2(chunk_paths[0], output_path)
+            if chunk_docs:
+                output_path.write_bytes(chunk_docs[0])
                 return output_path
             return None
 
-    def convert_docx_to_excel(self, docx_path: Path, source_type: str = "DOCX"):
-        """Convert DOCX tables to Excel sheets (same proven method)"""
+    def convert_docx_to_excel(self, docx_path: Path, source_type: str = "DOCX",
+                              chunk_size: Optional[int] = None):
+        """Convert DOCX tables to Excel sheets (same proven method)
+        
+        chunk_size is the size the PDF was actually converted with, for the summary.
+        """
         try:
-            doc = Document(docx_path)
-            total_tables = len(doc.tables)
-            logger.info(f"📊 Found {total_tables} tables in {docx_path.name}")
-            
-            if total_tables == 0:
-                logger.warning(f"⚠️ No tables found in {docx_path.name}")
-                return
-            
             extraction_start = time.time()
             
-            # Create Excel workbook
-            wb = Workbook()
-            wb.remove(wb.active)
-            
-            # Create summary sheet
-            self.create_summary_sheet(wb, total_tables, docx_path.name, source_type)
+            # Create Excel workbook; write-only mode streams each sheet's rows
+            # out as they are appended instead of keeping every cell in memory
+            wb = Workbook(write_only=True)
             
-            # Process each table
-            for table_index, table in enumerate(doc.tables):
+            # Process each table as it is parsed from document.xml
+            total_tables = 0
+            for table_index, tbl in enumerate(iter_docx_tables(docx_path)):
                 page_number = (table_index // 4) + 1
                 table_position = table_index % 4
                 table_name = self.table_names[table_position]
@@ -363,10 +526,20 @@ class ParallelChunkedConverter:
                 sheet_name = f"P{page_number}_{table_name[:20]}"
                 ws = wb.create_sheet(title=sheet_name)
                 
-                self.copy_table_to_sheet(table, ws, docx_path.name, page_number, table_name)
+                self.copy_table_to_sheet(tbl, ws, docx_path.name, page_number, table_name)
+                total_tables += 1
                 
-                if (table_index + 1) % 20 == 0:
-                    logger.info(f"📋 Processed {table_index + 1}/{total_tables} tables...")
+                if total_tables % 20 == 0:
+                    logger.info(f"📋 Processed {total_tables} tables...")
+            
+            logger.info(f"📊 Found {total_tables} tables in {docx_path.name}")
+            
+            if total_tables == 0:
+                logger.warning(f"⚠️ No tables found in {docx_path.name}")
+                return
+            
+            # Create summary sheet (placed first)
+            self.create_summary_sheet(wb, total_tables, docx_path.name, source_type, chunk_size)
             
             # Save Excel file
             excel_filename = f"{docx_path.stem}_extracted.xlsx"
@@ -388,72 +561,64 @@ class ParallelChunkedConverter:
         except Exception as e:
             logger.error(f"❌ Error processing {docx_path.name}: {e}")
 
-    def copy_table_to_sheet(self, table, ws, filename, page_number, table_name):
-        """Copy DOCX table to Excel worksheet (proven method)"""
-        ws['A1'] = f"Source: {filename}"
-        ws['A2'] = f"Page: {page_number}"
-        ws['A3'] = f"Table: {table_name}"
-        ws['A4'] = f"Rows: {len(table.rows)}"
-        ws['A5'] = f"Columns: {len(table.columns) if table.rows else 0}"
-        
-        start_row = 7
+    def copy_table_to_sheet(self, tbl, ws, filename, page_number, table_name):
+        """Copy a DOCX <w:tbl> element to Excel worksheet (proven method)"""
+        rows = table_rows_text(tbl)
+        num_columns = int(_GRID_COLUMNS(tbl)) if rows else 0
         
-        for row_index, table_row in enumerate(table.rows):
-            excel_row = start_row + row_index
-            for col_index, cell in enumerate(table_row.cells):
-                excel_col = col_index + 1
-                cell_text = cell.text.strip()
-                ws.cell(row=excel_row, column=excel_col, value=cell_text)
+        # Metadata block in A1:A5, a blank row, then the table from row 7
+        ws.append(self.bold_row(ws, [f"Source: {filename}"]))
+        ws.append(self.bold_row(ws, [f"Page: {page_number}"]))
+        ws.append(self.bold_row(ws, [f"Table: {table_name}"]))
+        ws.append(self.bold_row(ws, [f"Rows: {len(rows)}"]))
+        ws.append(self.bold_row(ws, [f"Columns: {num_columns}"]))
+        ws.append([])
         
-        self.apply_basic_formatting(ws, start_row, len(table.rows))
+        for row_index, row_values in enumerate(rows):
+            if row_index == 0:
+                # Write-only sheets can't be restyled later, so style the header now
+                ws.append(self.bold_row(ws, row_values, fill=self.HEADER_FILL))
+            else:
+                ws.append(row_values)
 
-    def apply_basic_formatting(self, ws, start_row, num_rows):
-        """Apply basic formatting"""
-        for row in ws[1:5]:
-            for cell in row:
-                if cell.value:
-                    cell.font = Font(bold=True)
-        
-        if num_rows > 0:
-            for cell in ws[start_row]:
-                if cell.value:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+    def bold_row(self, ws, values, fill=None):
+        """Wrap row values in bold write-only cells (empty values stay unstyled)"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            if value:
+                cell.font = self.BOLD
+                if fill is not None:
+                    cell.fill = fill
+            cells.append(cell)
+        return cells
 
-    def create_summary_sheet(self, wb, total_tables, filename, source_type):
+    def create_summary_sheet(self, wb, total_tables, filename, source_type, chunk_size=None):
         """Create summary sheet with parallel processing info"""
         ws = wb.create_sheet(title="Summary", index=0)
         
-        ws['A1'] = "⚡ Parallel Chunked PDF→DOCX→Excel Converter"
-        ws['A1'].font = Font(size=16, bold=True)
-        
-        ws['A3'] = f"Source Type: {source_type}"
-        ws['A4'] = f"Source File: {filename}"
-        ws['A5'] = f"Total Tables: {total_tables}"
-        ws['A6'] = f"Chunk Size: {self.chunk_size} pages"
-        ws['A7'] = f"Max Workers: {self.max_workers}"
-        ws['A8'] = f"CPU Cores: {multiprocessing.cpu_count()}"
+        title = WriteOnlyCell(ws, value="⚡ Parallel Chunked PDF→DOCX→Excel Converter")
+        title.font = self.TITLE_FONT
+        ws.append([title])
+        ws.append([])
         
         total_pages = (total_tables + 3) // 4
-        ws['A9'] = f"Total Pages: {total_pages}"
-        ws['A10'] = f"Processing Method: Parallel chunking"
+        ws.append([f"Source Type: {source_type}"])
+        ws.append([f"Source File: {filename}"])
+        ws.append([f"Total Tables: {total_tables}"])
+        # The size picked for this PDF, or the configured upper bound when no chunking was done
+        ws.append([f"Chunk Size: {chunk_size or self.chunk_size} pages"])
+        ws.append([f"Max Workers: {self.max_workers}"])
+        ws.append([f"CPU Cores: {multiprocessing.cpu_count()}"])
+        ws.append([f"Total Pages: {total_pages}"])
+        ws.append([f"Processing Method: Parallel chunking"])
+        ws.append([])
         
-        ws['A12'] = "Parallel Processing Benefits:"
-        ws['A12'].font = Font(bold=True)
-        ws['A13'] = "🚀 Multi-core utilization"
-        ws['A14'] = "⚡ Simultaneous chunk processing"
-        ws['A15'] = "🔧 Complete table preservation"
-        ws['A16'] = "📊 Maximum speed optimization"
-
-    def cleanup_temp_files(self):
-        """Clean up temporary chunk files"""
-        try:
-            chunk_files = list(self.chunks_folder.glob("*_chunk_*.docx"))
-            for chunk_file in chunk_files:
-                chunk_file.unlink()
-            logger.info(f"🧹 Cleaned up {len(chunk_files)} temporary chunk files")
-        except Exception as e:
-            logger.warning(f"Could not clean up temp files: {e}")
+        ws.append(self.bold_row(ws, ["Parallel Processing Benefits:"]))
+        ws.append(["🚀 Multi-core utilization"])
+        ws.append(["⚡ Simultaneous chunk processing"])
+        ws.append(["🔧 Complete table preservation"])
+        ws.append(["📊 Maximum speed optimization"])
 
 
 def main():
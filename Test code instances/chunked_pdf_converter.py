@@ -6,19 +6,27 @@ Fixes chunk combination to preserve all 96 tables while maintaining speed gains
 
 import os
 import sys
+import gc
+import shutil
 from pathlib import Path
 import logging
 from typing import Optional, List, Tuple
 import time
 import tempfile
+import argparse
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from pdf2docx import Converter
     from docx import Document
     from docx.shared import Inches
+    from docx.oxml import parse_xml
     from docx.oxml.shared import OxmlElement, qn
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
 except ImportError as e:
     print(f"Missing required packages. Install with:")
     print("pip install pdf2docx python-docx openpyxl")
@@ -28,10 +36,60 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Shared cell styles (openpyxl styles are immutable, one instance serves every sheet)
+_BOLD = Font(bold=True)
+_HEADER_FILL = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+
+# Clark-notation WordprocessingML tag names, resolved once for the lxml walks below
+W_P, W_R, W_T, W_BR, W_CR, W_TAB = qn('w:p'), qn('w:r'), qn('w:t'), qn('w:br'), qn('w:cr'), qn('w:tab')
+W_TYPE = qn('w:type')
+W_TBL, W_BODY = qn('w:tbl'), qn('w:body')
+
+
+def cell_text(tc) -> str:
+    """Text of a <w:tc> as python-docx's cell.text renders it, read in one lxml pass"""
+    parts = []
+    for index, p in enumerate(tc.iterchildren(W_P)):
+        if index:
+            parts.append('\n')
+        for node in p.iter(W_T, W_BR, W_CR, W_TAB):
+            if node.tag == W_T:
+                parts.append(node.text or '')
+            elif node.getparent().tag != W_R:
+                continue  # tab stops in paragraph properties
+            elif node.tag == W_TAB:
+                parts.append('\t')
+            elif node.tag == W_CR or node.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+    return ''.join(parts)
+
+
+def table_rows_text(table):
+    """Yield stripped cell text per row, expanding merged cells like python-docx's row.cells"""
+    # Each <w:tc> is read once: horizontal spans repeat the value across the spanned
+    # columns and vertical merge continuations reuse the value from the row above
+    above = {}
+    for tr in table._tbl.tr_lst:
+        row_values = []
+        current = {}
+        grid_offset = tr.grid_before
+        for tc in tr.tc_lst:
+            span = tc.grid_span
+            if tc.vMerge == 'continue' and grid_offset in above:
+                value, span = above[grid_offset]
+            else:
+                value = cell_text(tc).strip()
+            current[grid_offset] = (value, span)
+            row_values.extend([value] * span)
+            grid_offset += span
+        above = current
+        yield row_values
+
 class FixedChunkedConverter:
     """Fixed chunked converter with proper table preservation"""
     
-    def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data", chunk_size: int = 6):
+    def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data", chunk_size: int = 6,
+                 max_workers: int = 8):
         self.input_folder = Path(input_folder)
         self.output_folder = Path(output_folder)
         self.docx_folder = self.output_folder / "converted_docx"
@@ -44,6 +102,7 @@ class FixedChunkedConverter:
         
         # Chunking configuration
         self.chunk_size = chunk_size
+        self.max_workers = max(1, max_workers)  # threads loading chunks for combination
         logger.info(f"🔧 Configured for {chunk_size} pages per chunk")
         
         # Table names in order (4 per page)
@@ -221,18 +280,25 @@ class FixedChunkedConverter:
             
             total_tables_added = 0
             
+            # Load chunks concurrently (zip/XML parsing), then merge serially in order
+            # since the combined lxml tree can't be mutated from several threads
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunk_paths))) as executor:
+                chunk_bodies = list(executor.map(self.load_chunk_body, chunk_paths))
+            
             # Process each chunk
             for i, chunk_path in enumerate(chunk_paths):
                 logger.info(f"📋 Processing chunk {i + 1}: {chunk_path.name}")
                 
-                chunk_doc = Document(str(chunk_path))
-                chunk_tables = len(chunk_doc.tables)
+                # Take the chunk out of the preloaded list so its tree can be freed once merged
+                chunk_body, chunk_bodies[i] = chunk_bodies[i], None
+                
+                chunk_tables = len(chunk_body.findall(W_TBL))
                 logger.info(f"  Found {chunk_tables} tables in chunk {i + 1}")
                 
-                # Copy all elements from chunk
-                for element in chunk_doc.element.body:
+                # Move all elements over from chunk (chunk documents are discarded afterwards)
+                for element in list(chunk_body):
                     # Import the element to the combined document
-                    imported_element = self.import_element(element, combined_doc)
+                    imported_element = self.import_element(element)
                     if imported_element is not None:
                         combined_doc.element.body.append(imported_element)
                 
@@ -242,14 +308,18 @@ class FixedChunkedConverter:
                 
                 total_tables_added += chunk_tables
                 logger.info(f"  ✅ Added {chunk_tables} tables from chunk {i + 1}")
+                
+                # Release the emptied chunk tree, collecting leftover proxies every 4 chunks
+                del chunk_body
+                if (i & 3) == 3:
+                    gc.collect()
+            
+            # Verify final result in memory (no need to re-open the saved file)
+            final_table_count = len(combined_doc.tables)
             
             # Save combined document
             combined_doc.save(str(output_path))
             
-            # Verify final result
-            verification_doc = Document(str(output_path))
-            final_table_count = len(verification_doc.tables)
-            
             logger.info(f"🔍 Combination verification:")
             logger.info(f"  Expected tables: {total_tables_added}")
             logger.info(f"  Final tables: {final_table_count}")
@@ -270,13 +340,21 @@ class FixedChunkedConverter:
             # Fallback to alternative method
             return self.alternative_combine_chunks(chunk_paths, output_path)
 
-    def import_element(self, element, target_doc):
+    def load_chunk_body(self, chunk_path: Path):
+        """Parse a chunk's <w:body> straight from word/document.xml (skips the python-docx object graph)"""
+        with zipfile.ZipFile(chunk_path) as docx_zip:
+            root = parse_xml(docx_zip.read('word/document.xml'))
+        return root.find(W_BODY)
+
+    def import_element(self, element):
         """Safely import an element from one document to another"""
         try:
-            # Create a deep copy of the element
-            import copy
-            imported = copy.deepcopy(element)
-            return imported
+            # Detach instead of deep-copying: lxml re-parents the node in O(1),
+            # while copy.deepcopy walks every node of the table in Python
+            parent = element.getparent()
+            if parent is not None:
+                parent.remove(element)
+            return element
         except Exception as e:
             logger.debug(f"Could not import element: {e}")
             return None
@@ -291,47 +369,27 @@ class FixedChunkedConverter:
                 return None
             
             # Simply use the first chunk as base and append content from others
-            import shutil
-            shutil.copy2(chunk_paths[0], output_path)
-            
-            # Open the base document
-            combined_doc = Document(str(output_path))
+            # (opened in place, the combined result is saved to output_path)
+            combined_doc = Document(str(chunk_paths[0]))
             
             # Append content from remaining chunks
             for chunk_path in chunk_paths[1:]:
-                chunk_doc = Document(str(chunk_path))
+                chunk_body = self.load_chunk_body(chunk_path)
                 
                 # Add page break
                 combined_doc.add_page_break()
                 
-                # Copy paragraphs and tables from chunk
-                for para in chunk_doc.paragraphs:
-                    new_para = combined_doc.add_paragraph(para.text)
-                    # Copy paragraph formatting if possible
-                    try:
-                        new_para.style = para.style
-                    except:
-                        pass
-                
-                # Copy tables
-                for table in chunk_doc.tables:
-                    # Add table to combined document
-                    try:
-                        new_table = combined_doc.add_table(len(table.rows), len(table.columns))
-                        
-                        # Copy table content
-                        for i, row in enumerate(table.rows):
-                            for j, cell in enumerate(row.cells):
-                                new_table.rows[i].cells[j].text = cell.text
-                    except Exception as e:
-                        logger.warning(f"Could not copy table: {e}")
+                # Move paragraphs and tables over as-is (same import as the fixed method)
+                for element in list(chunk_body):
+                    imported_element = self.import_element(element)
+                    if imported_element is not None:
+                        combined_doc.element.body.append(imported_element)
+            
+            # Verify result in memory before saving
+            final_count = len(combined_doc.tables)
             
             # Save combined document
             combined_doc.save(str(output_path))
-            
-            # Verify result
-            verification_doc = Document(str(output_path))
-            final_count = len(verification_doc.tables)
             logger.info(f"✅ Alternative combination: {final_count} tables in final document")
             
             return output_path
@@ -340,7 +398,12 @@ class FixedChunkedConverter:
             logger.error(f"Alternative combination also failed: {e}")
             # Last resort: use first chunk only
             if chunk_paths:
-                shutil.copy2(chunk_paths[0], output_path)
+                # Hard link when possible (same filesystem) instead of rewriting the file
+                output_path.unlink(missing_ok=True)
+                try:
+                    os.link(chunk_paths[0], output_path)
+                except OSError:
+                    shutil.copy2(chunk_paths[0], output_path)
                 logger.info("Using first chunk as fallback")
                 return output_path
             return None
@@ -350,7 +413,8 @@ class FixedChunkedConverter:
         try:
             # Open DOCX document
             doc = Document(docx_path)
-            total_tables = len(doc.tables)
+            tables = doc.tables
+            total_tables = len(tables)
             logger.info(f"📊 Found {total_tables} tables in {docx_path.name}")
             
             if total_tables == 0:
@@ -360,14 +424,13 @@ class FixedChunkedConverter:
             extraction_start = time.time()
             
             # Create Excel workbook
-            wb = Workbook()
-            wb.remove(wb.active)  # Remove default sheet
+            wb = Workbook(write_only=True)
             
             # Create summary sheet first
             self.create_summary_sheet(wb, total_tables, docx_path.name, source_type)
             
             # Process each table (same proven method)
-            for table_index, table in enumerate(doc.tables):
+            for table_index, table in enumerate(tables):
                 # Calculate page and table position
                 page_number = (table_index // 4) + 1
                 table_position = table_index % 4
@@ -382,6 +445,9 @@ class FixedChunkedConverter:
                 # Copy table data directly (proven perfect method!)
                 self.copy_table_to_sheet(table, ws, docx_path.name, page_number, table_name)
                 
+                # Finish the sheet's XML now so only one sheet stream is open at a time
+                ws.close()
+                
                 if (table_index + 1) % 20 == 0:
                     logger.info(f"📋 Processed {table_index + 1}/{total_tables} tables...")
             
@@ -409,86 +475,91 @@ class FixedChunkedConverter:
 
     def copy_table_to_sheet(self, table, ws, filename, page_number, table_name):
         """Copy DOCX table to Excel worksheet exactly as-is (proven perfect method)"""
-        # Add metadata
-        ws['A1'] = f"Source: {filename}"
-        ws['A2'] = f"Page: {page_number}"
-        ws['A3'] = f"Table: {table_name}"
-        ws['A4'] = f"Rows: {len(table.rows)}"
-        ws['A5'] = f"Columns: {len(table.columns) if table.rows else 0}"
+        # Each .rows/.columns access re-queries the table XML, so count once
+        num_rows = len(table.rows)
+        num_cols = len(table.columns) if num_rows else 0
         
-        # Start copying table data from row 7
-        start_row = 7
+        # Metadata block in A1:A5
+        metadata = [
+            f"Source: {filename}",
+            f"Page: {page_number}",
+            f"Table: {table_name}",
+            f"Rows: {num_rows}",
+            f"Columns: {num_cols}",
+        ]
         
-        for row_index, table_row in enumerate(table.rows):
-            excel_row = start_row + row_index
-            
-            for col_index, cell in enumerate(table_row.cells):
-                excel_col = col_index + 1
-                cell_text = cell.text.strip()
-                
-                # Copy cell content directly - no processing, no filtering
-                ws.cell(row=excel_row, column=excel_col, value=cell_text)
+        # Write-only sheets emit column widths before the first row, so track
+        # the longest value per column while the cell text is collected
+        col_widths = {1: max(len(line) for line in metadata)}
+        rows = []
+        
+        # Copy cell content directly - no processing, no filtering
+        for row_values in table_rows_text(table):
+            for col_index, value in enumerate(row_values, 1):
+                col_widths[col_index] = max(col_widths.get(col_index, 0), len(value))
+            rows.append(row_values)
         
         # Apply basic formatting
-        self.apply_basic_formatting(ws, start_row, len(table.rows))
-
-    def apply_basic_formatting(self, ws, start_row, num_rows):
-        """Apply basic formatting to the worksheet"""
-        # Format metadata
-        for row in ws[1:5]:
-            for cell in row:
-                if cell.value:
-                    cell.font = Font(bold=True)
+        self.apply_basic_formatting(ws, col_widths)
         
-        # Format first row of table (likely headers)
-        if num_rows > 0:
-            header_row = start_row
-            for cell in ws[header_row]:
-                if cell.value:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+        for line in metadata:
+            ws.append(self.bold_row(ws, [line]))
+        ws.append([])
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if cell.value and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            # Set column width (max 30 chars)
-            adjusted_width = min(max_length + 2, 30)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        # Table data starts at row 7, first row (likely headers) styled as it's written
+        for row_index, row_values in enumerate(rows):
+            if row_index == 0:
+                ws.append(self.bold_row(ws, row_values, fill=_HEADER_FILL))
+            else:
+                ws.append(row_values)
+
+    def bold_row(self, ws, values, fill=None):
+        """Wrap row values in bold write-only cells (empty values stay unstyled)"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            if value:
+                cell.font = _BOLD
+                if fill is not None:
+                    cell.fill = fill
+            cells.append(cell)
+        return cells
+
+    def apply_basic_formatting(self, ws, col_widths):
+        """Apply basic formatting to the worksheet"""
+        # Auto-adjust column widths (max 30 chars)
+        for col_index, max_length in col_widths.items():
+            ws.column_dimensions[get_column_letter(col_index)].width = min(max_length + 2, 30)
 
     def create_summary_sheet(self, wb, total_tables, filename, source_type):
         """Create summary sheet with fixed chunking info"""
         ws = wb.create_sheet(title="Summary", index=0)
         
-        ws['A1'] = "🔧 Fixed Chunked PDF→DOCX→Excel Converter"
-        ws['A1'].font = Font(size=16, bold=True)
+        title = WriteOnlyCell(ws, value="🔧 Fixed Chunked PDF→DOCX→Excel Converter")
+        title.font = Font(size=16, bold=True)
+        ws.append([title])
+        ws.append([])
         
-        ws['A3'] = f"Source Type: {source_type}"
-        ws['A4'] = f"Source File: {filename}"
-        ws['A5'] = f"Total Tables: {total_tables}"
-        ws['A6'] = f"Chunk Size: {self.chunk_size} pages"
+        ws.append([f"Source Type: {source_type}"])
+        ws.append([f"Source File: {filename}"])
+        ws.append([f"Total Tables: {total_tables}"])
+        ws.append([f"Chunk Size: {self.chunk_size} pages"])
         
         total_pages = (total_tables + 3) // 4
-        ws['A7'] = f"Total Pages: {total_pages}"
-        ws['A8'] = f"Number of Chunks: {(total_pages + self.chunk_size - 1) // self.chunk_size}"
-        ws['A9'] = f"Tables per Page: 4"
-        ws['A10'] = f"Processing Method: Fixed chunk combination"
+        ws.append([f"Total Pages: {total_pages}"])
+        ws.append([f"Number of Chunks: {(total_pages + self.chunk_size - 1) // self.chunk_size}"])
+        ws.append([f"Tables per Page: 4"])
+        ws.append([f"Processing Method: Fixed chunk combination"])
+        ws.append([])
         
-        ws['A12'] = "Fixed Combination Features:"
-        ws['A12'].font = Font(bold=True)
-        ws['A13'] = "✅ Complete table preservation"
-        ws['A14'] = "✅ Proper element importing"
-        ws['A15'] = "✅ Fallback combination methods"
-        ws['A16'] = "✅ Table count verification"
-        ws['A17'] = "✅ Same perfect extraction quality"
+        ws.append(self.bold_row(ws, ["Fixed Combination Features:"]))
+        ws.append(["✅ Complete table preservation"])
+        ws.append(["✅ Proper element importing"])
+        ws.append(["✅ Fallback combination methods"])
+        ws.append(["✅ Table count verification"])
+        ws.append(["✅ Same perfect extraction quality"])
+        
+        ws.close()
 
     def cleanup_temp_files(self):
         """Clean up temporary chunk files"""
@@ -513,17 +584,30 @@ def main():
     print("  • Same fast chunking speed + perfect results")
     print("=" * 60)
     
+    parser = argparse.ArgumentParser(description="Fixed chunked PDF→DOCX→Excel converter")
+    parser.add_argument("--input", default="input", help="folder with PDF/DOCX files (default: input)")
+    parser.add_argument("--output", default="extracted_data", help="output folder (default: extracted_data)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="pages per chunk (default: 6)")
+    parser.add_argument("--workers", type=int, default=8, help="threads loading chunks while combining (default: 8)")
+    parser.add_argument("--cleanup", action="store_true", help="delete intermediate DOCX files when done")
+    args = parser.parse_args()
+    
+    # Only prompt when someone is at the terminal, batch runs use the flags/defaults
+    interactive = sys.stdin.isatty()
+    
     # Allow custom chunk size
-    chunk_size = 6  # Default
-    try:
-        user_input = input(f"Enter chunk size (pages per chunk, default {chunk_size}): ").strip()
-        if user_input:
-            chunk_size = int(user_input)
-            print(f"✅ Using chunk size: {chunk_size} pages")
-    except ValueError:
-        print(f"Using default chunk size: {chunk_size} pages")
+    chunk_size = args.chunk_size or 6  # Default
+    if args.chunk_size is None and interactive:
+        try:
+            user_input = input(f"Enter chunk size (pages per chunk, default {chunk_size}): ").strip()
+            if user_input:
+                chunk_size = int(user_input)
+                print(f"✅ Using chunk size: {chunk_size} pages")
+        except ValueError:
+            print(f"Using default chunk size: {chunk_size} pages")
     
-    converter = FixedChunkedConverter(chunk_size=chunk_size)
+    converter = FixedChunkedConverter(input_folder=args.input, output_folder=args.output,
+                                      chunk_size=chunk_size, max_workers=args.workers)
     
     # Process all files
     converter.process_all_files()
@@ -532,8 +616,10 @@ def main():
     print(f"\n📁 DOCX files saved in: {converter.docx_folder}")
     print(f"💾 Excel files saved in: {converter.output_folder}")
     
-    cleanup = input("\n🗑️ Delete intermediate DOCX files? (y/N): ").lower()
-    if cleanup == 'y':
+    cleanup = args.cleanup
+    if not cleanup and interactive:
+        cleanup = input("\n🗑️ Delete intermediate DOCX files? (y/N): ").lower() == 'y'
+    if cleanup:
         docx_files = list(converter.docx_folder.glob("*.docx"))
         for docx_file in docx_files:
             docx_file.unlink()
@@ -10,13 +10,18 @@ import os
 import sys
 from pathlib import Path
 import logging
+import argparse
 from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     from pdf2docx import Converter
     from docx import Document
+    from docx.oxml.ns import qn
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
 except ImportError as e:
     print(f"Missing required packages. Install with:")
     print("pip install pdf2docx python-docx openpyxl")
@@ -26,14 +31,69 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Shared cell styles (openpyxl styles are immutable, one instance serves every sheet)
+_BOLD = Font(bold=True)
+_HEADER_FILL = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+
+# Clark-notation WordprocessingML tag names, resolved once for the lxml walks below
+W_P, W_R, W_T, W_BR, W_CR, W_TAB = qn('w:p'), qn('w:r'), qn('w:t'), qn('w:br'), qn('w:cr'), qn('w:tab')
+W_TYPE = qn('w:type')
+
+
+def cell_text(tc) -> str:
+    """Text of a <w:tc> as python-docx's cell.text renders it, read in one lxml pass"""
+    parts = []
+    for index, p in enumerate(tc.iterchildren(W_P)):
+        if index:
+            parts.append('\n')
+        for node in p.iter(W_T, W_BR, W_CR, W_TAB):
+            if node.tag == W_T:
+                parts.append(node.text or '')
+            elif node.getparent().tag != W_R:
+                continue  # tab stops in paragraph properties
+            elif node.tag == W_TAB:
+                parts.append('\t')
+            elif node.tag == W_CR or node.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+    return ''.join(parts)
+
+
+def table_rows_text(table):
+    """Yield stripped cell text per row, expanding merged cells like python-docx's row.cells"""
+    # Each <w:tc> is read once: horizontal spans repeat the value across the spanned
+    # columns and vertical merge continuations reuse the value from the row above
+    above = {}
+    for tr in table._tbl.tr_lst:
+        row_values = []
+        current = {}
+        grid_offset = tr.grid_before
+        for tc in tr.tc_lst:
+            span = tc.grid_span
+            if tc.vMerge == 'continue' and grid_offset in above:
+                value, span = above[grid_offset]
+            else:
+                value = cell_text(tc).strip()
+            current[grid_offset] = (value, span)
+            row_values.extend([value] * span)
+            grid_offset += span
+        above = current
+        yield row_values
+
 class CompletePdfToExcelConverter:
     """Complete pipeline: PDF → DOCX → Excel with perfect table extraction"""
     
-    def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data"):
+    def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data",
+                 max_workers: Optional[int] = None, pdf_cpu_count: Optional[int] = None):
         self.input_folder = Path(input_folder)
         self.output_folder = Path(output_folder)
         self.docx_folder = self.output_folder / "converted_docx"
         
+        # Files are independent pipelines, run one per core (leave one for the OS)
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1) - 1)
+        
+        # pdf2docx page-level workers per PDF (half the cores, 1 = single process)
+        self.pdf_cpu_count = pdf_cpu_count or max(1, (os.cpu_count() or 1) // 2)
+        
         # Create necessary folders
         self.output_folder.mkdir(exist_ok=True)
         self.docx_folder.mkdir(exist_ok=True)
@@ -63,17 +123,24 @@ class CompletePdfToExcelConverter:
         
         print(f"📁 Found {len(pdf_files)} PDF files and {len(docx_files)} DOCX files")
         
-        # Process PDF files first (convert to DOCX)
-        for pdf_file in pdf_files:
-            logger.info(f"Processing PDF: {pdf_file.name}")
-            docx_path = self.convert_pdf_to_docx(pdf_file)
-            if docx_path:
-                self.convert_docx_to_excel(docx_path, source_type="PDF")
+        # PDF files first (convert to DOCX), then existing DOCX files
+        max_workers = min(self.max_workers, len(pdf_files) + len(docx_files))
         
-        # Process existing DOCX files
-        for docx_file in docx_files:
-            logger.info(f"Processing DOCX: {docx_file.name}")
-            self.convert_docx_to_excel(docx_file, source_type="DOCX")
+        # pdf2docx multi-processing writes pages-N.json into the working directory,
+        # so it is only safe while one PDF converts at a time
+        pdf_cpu_count = self.pdf_cpu_count if max_workers <= 1 else 1
+        job_settings = (str(self.input_folder), str(self.output_folder), pdf_cpu_count)
+        jobs = [(pdf_file, "PDF") + job_settings for pdf_file in pdf_files]
+        jobs += [(docx_file, "DOCX") + job_settings for docx_file in docx_files]
+        
+        if max_workers <= 1:
+            for job in jobs:
+                _process_one(job)
+            return
+        
+        logger.info(f"🚀 Processing {len(jobs)} files with {max_workers} workers")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_process_one, jobs))
 
     def convert_pdf_to_docx(self, pdf_path: Path) -> Optional[Path]:
         """Convert PDF to DOCX using pdf2docx"""
@@ -86,9 +153,10 @@ class CompletePdfToExcelConverter:
         try:
             logger.info(f"🔄 Converting {pdf_path.name} to DOCX...")
             
-            # Use pdf2docx for conversion
+            # Use pdf2docx for conversion, parsing pages in parallel when allowed
             cv = Converter(str(pdf_path))
-            cv.convert(str(docx_path), start=0, end=None)
+            cv.convert(str(docx_path), start=0, end=None,
+                       multi_processing=self.pdf_cpu_count > 1, cpu_count=self.pdf_cpu_count)
             cv.close()
             
             logger.info(f"✅ Successfully converted to {docx_path.name}")
@@ -103,21 +171,22 @@ class CompletePdfToExcelConverter:
         try:
             # Open DOCX document
             doc = Document(docx_path)
-            logger.info(f"📊 Found {len(doc.tables)} tables in {docx_path.name}")
+            tables = doc.tables
+            total_tables = len(tables)
+            logger.info(f"📊 Found {total_tables} tables in {docx_path.name}")
             
-            if len(doc.tables) == 0:
+            if total_tables == 0:
                 logger.warning(f"⚠️ No tables found in {docx_path.name}")
                 return
             
             # Create Excel workbook
-            wb = Workbook()
-            wb.remove(wb.active)  # Remove default sheet
+            wb = Workbook(write_only=True)
             
             # Create summary sheet first
-            self.create_summary_sheet(wb, len(doc.tables), docx_path.name, source_type)
+            self.create_summary_sheet(wb, total_tables, docx_path.name, source_type)
             
             # Process each table
-            for table_index, table in enumerate(doc.tables):
+            for table_index, table in enumerate(tables):
                 # Calculate page and table position
                 page_number = (table_index // 4) + 1
                 table_position = table_index % 4
@@ -132,8 +201,11 @@ class CompletePdfToExcelConverter:
                 # Copy table data directly (the perfect method!)
                 self.copy_table_to_sheet(table, ws, docx_path.name, page_number, table_name)
                 
+                # Finish the sheet's XML now so only one sheet stream is open at a time
+                ws.close()
+                
                 if (table_index + 1) % 20 == 0:  # Progress update every 20 tables
-                    logger.info(f"📋 Processed {table_index + 1}/{len(doc.tables)} tables...")
+                    logger.info(f"📋 Processed {table_index + 1}/{total_tables} tables...")
             
             # Save Excel file
             excel_filename = f"{docx_path.stem}_extracted.xlsx"
@@ -141,114 +213,121 @@ class CompletePdfToExcelConverter:
             wb.save(excel_path)
             
             # Print success summary
-            total_pages = (len(doc.tables) + 3) // 4  # Round up division
+            total_pages = (total_tables + 3) // 4  # Round up division
             print(f"\n🎉 SUCCESS! Conversion Complete for {docx_path.name}")
             print(f"📄 Source: {source_type}")
-            print(f"📊 Tables Extracted: {len(doc.tables)}")
+            print(f"📊 Tables Extracted: {total_tables}")
             print(f"📋 Pages Processed: {total_pages}")
             print(f"💾 Excel File: {excel_path}")
             print("=" * 60)
             
-            logger.info(f"✅ Saved {len(doc.tables)} tables to {excel_path}")
+            logger.info(f"✅ Saved {total_tables} tables to {excel_path}")
             
         except Exception as e:
             logger.error(f"❌ Error processing {docx_path.name}: {e}")
 
     def copy_table_to_sheet(self, table, ws, filename, page_number, table_name):
         """Copy DOCX table to Excel worksheet exactly as-is (proven perfect method)"""
-        # Add metadata
-        ws['A1'] = f"Source: {filename}"
-        ws['A2'] = f"Page: {page_number}"
-        ws['A3'] = f"Table: {table_name}"
-        ws['A4'] = f"Rows: {len(table.rows)}"
-        ws['A5'] = f"Columns: {len(table.columns) if table.rows else 0}"
+        # Each .rows/.columns access re-queries the table XML, so count once
+        num_rows = len(table.rows)
+        num_cols = len(table.columns) if num_rows else 0
         
-        # Start copying table data from row 7
-        start_row = 7
+        # Metadata block in A1:A5
+        metadata = [
+            f"Source: {filename}",
+            f"Page: {page_number}",
+            f"Table: {table_name}",
+            f"Rows: {num_rows}",
+            f"Columns: {num_cols}",
+        ]
         
-        for row_index, table_row in enumerate(table.rows):
-            excel_row = start_row + row_index
-            
-            for col_index, cell in enumerate(table_row.cells):
-                excel_col = col_index + 1
-                cell_text = cell.text.strip()
-                
-                # Copy cell content directly - no processing, no filtering
-                ws.cell(row=excel_row, column=excel_col, value=cell_text)
+        # Write-only sheets emit column widths before the first row, so track
+        # the longest value per column while the cell text is collected
+        col_widths = {1: max(len(line) for line in metadata)}
+        rows = []
+        
+        # Copy cell content directly - no processing, no filtering
+        for row_values in table_rows_text(table):
+            for col_index, value in enumerate(row_values, 1):
+                col_widths[col_index] = max(col_widths.get(col_index, 0), len(value))
+            rows.append(row_values)
         
         # Apply basic formatting
-        self.apply_basic_formatting(ws, start_row, len(table.rows))
-
-    def apply_basic_formatting(self, ws, start_row, num_rows):
-        """Apply basic formatting to the worksheet"""
-        # Format metadata
-        for row in ws[1:5]:
-            for cell in row:
-                if cell.value:
-                    cell.font = Font(bold=True)
+        self.apply_basic_formatting(ws, col_widths)
         
-        # Format first row of table (likely headers)
-        if num_rows > 0:
-            header_row = start_row
-            for cell in ws[header_row]:
-                if cell.value:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+        for line in metadata:
+            ws.append(self.bold_row(ws, [line]))
+        ws.append([])
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if cell.value and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            # Set column width (max 30 chars)
-            adjusted_width = min(max_length + 2, 30)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        # Table data starts at row 7, first row (likely headers) styled as it's written
+        for row_index, row_values in enumerate(rows):
+            if row_index == 0:
+                ws.append(self.bold_row(ws, row_values, fill=_HEADER_FILL))
+            else:
+                ws.append(row_values)
+
+    def bold_row(self, ws, values, fill=None):
+        """Wrap row values in bold write-only cells (empty values stay unstyled)"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            if value:
+                cell.font = _BOLD
+                if fill is not None:
+                    cell.fill = fill
+            cells.append(cell)
+        return cells
+
+    def apply_basic_formatting(self, ws, col_widths):
+        """Apply basic formatting to the worksheet"""
+        # Auto-adjust column widths (max 30 chars)
+        for col_index, max_length in col_widths.items():
+            ws.column_dimensions[get_column_letter(col_index)].width = min(max_length + 2, 30)
 
     def create_summary_sheet(self, wb, total_tables, filename, source_type):
         """Create summary sheet with conversion info"""
         ws = wb.create_sheet(title="Summary", index=0)
         
-        ws['A1'] = "PDF → DOCX → Excel Conversion Results"
-        ws['A1'].font = Font(size=16, bold=True)
+        title = WriteOnlyCell(ws, value="PDF → DOCX → Excel Conversion Results")
+        title.font = Font(size=16, bold=True)
+        ws.append([title])
+        ws.append([])
         
-        ws['A3'] = f"Source Type: {source_type}"
-        ws['A4'] = f"Source File: {filename}"
-        ws['A5'] = f"Total Tables: {total_tables}"
+        ws.append([f"Source Type: {source_type}"])
+        ws.append([f"Source File: {filename}"])
+        ws.append([f"Total Tables: {total_tables}"])
         
         total_pages = (total_tables + 3) // 4
-        ws['A6'] = f"Total Pages: {total_pages}"
-        ws['A7'] = f"Tables per Page: 4"
-        ws['A8'] = f"Extraction Method: Direct table copy (no parsing)"
+        ws.append([f"Total Pages: {total_pages}"])
+        ws.append([f"Tables per Page: 4"])
+        ws.append([f"Extraction Method: Direct table copy (no parsing)"])
+        ws.append([])
         
-        ws['A10'] = "Conversion Pipeline:"
-        ws['A10'].font = Font(bold=True)
+        ws.append(self.bold_row(ws, ["Conversion Pipeline:"]))
         
         if source_type == "PDF":
-            ws['A11'] = "1. PDF → DOCX (pdf2docx conversion)"
-            ws['A12'] = "2. DOCX → Excel (direct table copy)"
+            ws.append(["1. PDF → DOCX (pdf2docx conversion)"])
+            ws.append(["2. DOCX → Excel (direct table copy)"])
         else:
-            ws['A11'] = "1. DOCX → Excel (direct table copy)"
+            ws.append(["1. DOCX → Excel (direct table copy)"])
+            ws.append([])
+        ws.append([])
         
-        ws['A14'] = "Sheet Structure:"
-        ws['A14'].font = Font(bold=True)
+        ws.append(self.bold_row(ws, ["Sheet Structure:"]))
         
-        # Show sheet organization (first few pages)
-        row = 15
-        for page in range(1, min(total_pages + 1, 6)):  # Show first 5 pages
-            for i, table_name in enumerate(self.table_names):
-                sheet_name = f"P{page}_{table_name[:20]}"
-                ws[f'A{row}'] = f"├── {sheet_name}"
-                row += 1
+        # Show sheet organization (first few pages), built in one pass and appended as rows
+        short_names = [table_name[:20] for table_name in self.table_names]
+        structure_rows = [[f"├── P{page}_{short_name}"]
+                          for page in range(1, min(total_pages, 5) + 1)  # Show first 5 pages
+                          for short_name in short_names]
         
         if total_pages > 5:
-            ws[f'A{row}'] = f"... and {total_pages - 5} more pages"
+            structure_rows.append([f"... and {total_pages - 5} more pages"])
+        
+        for row in structure_rows:
+            ws.append(row)
+        
+        ws.close()
 
     def cleanup_intermediate_files(self, keep_docx: bool = True):
         """Clean up intermediate DOCX files if desired"""
@@ -259,6 +338,22 @@ class CompletePdfToExcelConverter:
                 logger.info(f"Cleaned up {docx_file.name}")
 
 
+def _process_one(job):
+    """Run a single PDF or DOCX file through the pipeline (worker process entry point)"""
+    file_path, source_type, input_folder, output_folder, pdf_cpu_count = job
+    converter = CompletePdfToExcelConverter(input_folder, output_folder, max_workers=1,
+                                            pdf_cpu_count=pdf_cpu_count)
+    
+    if source_type == "PDF":
+        logger.info(f"Processing PDF: {file_path.name}")
+        docx_path = converter.convert_pdf_to_docx(file_path)
+        if docx_path:
+            converter.convert_docx_to_excel(docx_path, source_type="PDF")
+    else:
+        logger.info(f"Processing DOCX: {file_path.name}")
+        converter.convert_docx_to_excel(file_path, source_type="DOCX")
+
+
 def main():
     """Main execution function"""
     print("🚀 Complete PDF → DOCX → Excel Converter Pipeline")
@@ -271,7 +366,16 @@ def main():
     print("  • Proven perfect results!")
     print("=" * 60)
     
-    converter = CompletePdfToExcelConverter()
+    parser = argparse.ArgumentParser(description="PDF → DOCX → Excel converter")
+    parser.add_argument("--input", default="input", help="folder with PDF/DOCX files (default: input)")
+    parser.add_argument("--output", default="extracted_data", help="output folder (default: extracted_data)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of files processed in parallel (default: CPU count - 1)")
+    parser.add_argument("--cleanup", action="store_true", help="delete intermediate DOCX files when done")
+    args = parser.parse_args()
+    
+    converter = CompletePdfToExcelConverter(input_folder=args.input, output_folder=args.output,
+                                            max_workers=args.workers)
     
     # Process all files
     converter.process_all_files()
@@ -280,8 +384,11 @@ def main():
     print(f"\n📁 DOCX files saved in: {converter.docx_folder}")
     print(f"💾 Excel files saved in: {converter.output_folder}")
     
-    cleanup = input("\n🗑️ Delete intermediate DOCX files? (y/N): ").lower()
-    if cleanup == 'y':
+    # Only prompt when someone is at the terminal, batch runs use --cleanup
+    cleanup = args.cleanup
+    if not cleanup and sys.stdin.isatty():
+        cleanup = input("\n🗑️ Delete intermediate DOCX files? (y/N): ").lower() == 'y'
+    if cleanup:
         converter.cleanup_intermediate_files(keep_docx=False)
         print("✅ Intermediate files cleaned up")
     else:
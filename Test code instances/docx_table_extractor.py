@@ -7,29 +7,115 @@ Combines PDF conversion with improved table parsing
 import os
 import re
 import sys
-import pandas as pd
+import shutil
+import hashlib
+import zipfile
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 import logging
+from functools import partial, lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 try:
-    import pdf2docx
-    from docx import Document
-    from docx.table import Table as DocxTable
+    from pdf2docx import Converter
+    from docx.oxml.ns import qn
+    from lxml import etree
     import pdfplumber
     from openpyxl import Workbook
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.cell import WriteOnlyCell
 except ImportError as e:
     print(f"Missing required packages. Install with:")
-    print("pip install pdf2docx python-docx pdfplumber pandas openpyxl")
+    print("pip install pdf2docx python-docx pdfplumber openpyxl")
     sys.exit(1)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Shared cell styles for the write-only workbook
+_BOLD = Font(bold=True)
+_TITLE_FONT = Font(size=16, bold=True)
+_HEADER_FONT = Font(color='FFFFFF', bold=True)
+_HEADER_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+_HEADER_ALIGNMENT = Alignment(horizontal='center')
+
+# Numbers with thousands separators, decimals and the ▲ negative marker
+_NUMBER_RE = re.compile(r'[▲]?[0-9,]+(?:\.[0-9]+)?')
+
+# Clark-notation WordprocessingML tag names for reading cells straight from the XML
+W_P, W_R, W_T, W_BR, W_CR, W_TAB = qn('w:p'), qn('w:r'), qn('w:t'), qn('w:br'), qn('w:cr'), qn('w:tab')
+W_TYPE = qn('w:type')
+W_BODY, W_TBL, W_TR, W_TC, W_VAL = qn('w:body'), qn('w:tbl'), qn('w:tr'), qn('w:tc'), qn('w:val')
+W_GRID_BEFORE = f"{qn('w:trPr')}/{qn('w:gridBefore')}"
+W_GRID_SPAN = f"{qn('w:tcPr')}/{qn('w:gridSpan')}"
+W_V_MERGE = f"{qn('w:tcPr')}/{qn('w:vMerge')}"
+
+
+def cell_text(tc) -> str:
+    """Text of a <w:tc> as python-docx's cell.text renders it, read in one lxml pass"""
+    parts = []
+    for index, p in enumerate(tc.iterchildren(W_P)):
+        if index:
+            parts.append('\n')
+        for node in p.iter(W_T, W_BR, W_CR, W_TAB):
+            if node.tag == W_T:
+                parts.append(node.text or '')
+            elif node.getparent().tag != W_R:
+                continue  # tab stops in paragraph properties
+            elif node.tag == W_TAB:
+                parts.append('\t')
+            elif node.tag == W_CR or node.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+    return ''.join(parts)
+
+
+def decimal_property(element, path: str, default: int) -> int:
+    """Integer w:val of a cell/row property such as gridSpan, or the default when absent"""
+    prop = element.find(path)
+    return int(prop.get(W_VAL)) if prop is not None and prop.get(W_VAL) else default
+
+
+def table_rows_text(tbl) -> List[List[str]]:
+    """Stripped cell text per row of a <w:tbl>, expanding merged cells like python-docx's row.cells"""
+    # Each <w:tc> is read once: horizontal spans repeat the value across the spanned
+    # columns and vertical merge continuations reuse the value from the row above
+    rows = []
+    above = {}
+    for tr in tbl.iterchildren(W_TR):
+        row_values = []
+        current = {}
+        grid_offset = decimal_property(tr, W_GRID_BEFORE, 0)
+        for tc in tr.iterchildren(W_TC):
+            span = decimal_property(tc, W_GRID_SPAN, 1)
+            v_merge = tc.find(W_V_MERGE)
+            if v_merge is not None and v_merge.get(W_VAL, 'continue') == 'continue' and grid_offset in above:
+                value, span = above[grid_offset]
+            else:
+                value = cell_text(tc).strip()
+            current[grid_offset] = (value, span)
+            row_values.extend([value] * span)
+            grid_offset += span
+        above = current
+        rows.append(row_values)
+    return rows
+
+
+def iter_docx_tables(docx_path: Path):
+    """Stream the top-level <w:tbl> elements of a DOCX, in the order of python-docx's doc.tables"""
+    with zipfile.ZipFile(docx_path) as docx_zip, docx_zip.open('word/document.xml') as document_xml:
+        for _, tbl in etree.iterparse(document_xml, tag=W_TBL):
+            body = tbl.getparent()
+            if body is None or body.tag != W_BODY:
+                continue  # nested table, read as part of its enclosing cell
+            yield tbl
+            # The table has been processed; drop it and the body content before it
+            while tbl.getprevious() is not None:
+                del body[0]
+            body.remove(tbl)
+
 class ExtractionMethod(Enum):
     """Available extraction methods"""
     DIRECT_PDF = "direct_pdf"
@@ -58,10 +144,12 @@ class TableData:
 class EnhancedTableExtractor:
     """Multi-method table extractor with PDF to DOCX conversion support"""
     
-    def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data"):
+    def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data",
+                 max_workers: Optional[int] = None):
         self.input_folder = Path(input_folder)
         self.output_folder = Path(output_folder)
         self.docx_folder = self.output_folder / "converted_docx"
+        self.max_workers = max_workers or os.cpu_count() or 1
         
         # Create necessary folders
         self.output_folder.mkdir(exist_ok=True)
@@ -100,52 +188,104 @@ class EnhancedTableExtractor:
             "買い": "Purchases", 
             "合計": "Total"
         }
+        
+        # Header lists indexed by table type priority. Japanese headers are matched against
+        # the raw text and English headers against its lowercased form, which is only built
+        # when no Japanese header of the first table type is present
+        self.table_types = list(self.table_patterns)
+        japanese_headers = [patterns['japanese_headers'] for patterns in self.table_patterns.values()]
+        english_headers = [[header.lower() for header in patterns['english_headers']]
+                           for patterns in self.table_patterns.values()]
+        
+        # One alternation per table type so header detection is a single regex scan
+        # instead of a Python loop of `in` checks
+        self.japanese_header_patterns = [re.compile('|'.join(map(re.escape, headers))) for headers in japanese_headers]
+        self.english_header_patterns = [re.compile('|'.join(map(re.escape, headers))) for headers in english_headers]
+        self.japanese_header_automaton = self.build_header_automaton(japanese_headers)
+        self.english_header_automaton = self.build_header_automaton(english_headers)
+        # Report pages repeat the same table headers, so type lookups are memoized per text
+        self.match_table_type = lru_cache(maxsize=256)(self.match_table_type)
+        
+        # Row category and transaction lookups, precompiled so each is one regex scan per row
+        self.category_matchers = {
+            table_type: self.build_term_matcher([[(category, category)] for category in patterns['expected_categories']])
+            for table_type, patterns in self.table_patterns.items()
+        }
+        self.transaction_matcher = self.build_term_matcher(
+            [[(jp_trans, en_trans), (en_trans, en_trans)] for jp_trans, en_trans in self.transaction_mappings.items()]
+        )
+
+    def pdf_content_hash(self, pdf_path: Path) -> str:
+        """Short SHA-256 of the PDF bytes, used to key cached conversions"""
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()[:16]
 
     def convert_pdf_to_docx(self, pdf_path: Path) -> Path:
         """Convert PDF to DOCX using pdf2docx"""
-        docx_path = self.docx_folder / f"{pdf_path.stem}.docx"
+        # Cached conversions are keyed on the PDF content, so renamed or copied
+        # files reuse an earlier conversion instead of running pdf2docx again
+        content_hash = self.pdf_content_hash(pdf_path)
+        docx_path = self.docx_folder / f"{pdf_path.stem}.{content_hash}.docx"
         
         if docx_path.exists():
             logger.info(f"DOCX already exists: {docx_path}")
             return docx_path
+        
+        cached_path = next(self.docx_folder.glob(f"*.{content_hash}.docx"), None)
+        if cached_path:
+            logger.info(f"Reusing conversion of identical PDF: {cached_path.name}")
+            try:
+                os.link(cached_path, docx_path)
+            except OSError:
+                shutil.copy2(cached_path, docx_path)
+            return docx_path
             
+        # Write to a temporary name first so an interrupted or failed conversion
+        # never leaves a partial file that the cache lookups above would reuse
+        partial_path = docx_path.with_name(f"{docx_path.name}.{os.getpid()}.part")
         try:
             logger.info(f"Converting {pdf_path.name} to DOCX...")
             
             # Use pdf2docx for conversion
-            from pdf2docx import Converter
             cv = Converter(str(pdf_path))
-            cv.convert(str(docx_path), start=0, end=None)
-            cv.close()
+            try:
+                cv.convert(str(partial_path), start=0, end=None)
+            finally:
+                cv.close()
+            os.replace(partial_path, docx_path)
             
             logger.info(f"Successfully converted to {docx_path}")
             return docx_path
             
         except Exception as e:
+            partial_path.unlink(missing_ok=True)
             logger.error(f"PDF to DOCX conversion failed: {e}")
             raise
 
     def extract_from_docx(self, docx_path: Path) -> List[TableData]:
         """Extract tables from DOCX document"""
         try:
-            doc = Document(docx_path)
             extracted_tables = []
+            table_count = 0
             
             logger.info(f"Processing DOCX: {docx_path.name}")
-            logger.info(f"Found {len(doc.tables)} tables in document")
             
             # Group tables by page (approximate)
             page_number = 1
             tables_per_page = []
             current_page_tables = []
             
-            # Process each table in the document
-            for table_idx, table in enumerate(doc.tables):
-                table_text = self.extract_table_text_from_docx_table(table)
-                table_type = self.identify_table_type(table_text)
+            # Process each table in the document as it is parsed, without loading the whole XML tree
+            for table_count, tbl in enumerate(iter_docx_tables(docx_path), 1):
+                # Cell text is read once and shared by type detection and parsing
+                rows = table_rows_text(tbl)
+                table_type = self.identify_table_type(rows)
                 
                 if table_type:
-                    table_data = self.parse_docx_table(table, table_type, page_number)
+                    table_data = self.parse_docx_table(rows, table_type, page_number)
                     if table_data:
                         extracted_tables.append(table_data)
                         current_page_tables.append(table_data)
@@ -160,6 +300,7 @@ class EnhancedTableExtractor:
             if current_page_tables:
                 tables_per_page.append(current_page_tables)
             
+            logger.info(f"Found {table_count} tables in document")
             logger.info(f"Extracted {len(extracted_tables)} tables from {len(tables_per_page)} pages")
             return extracted_tables
             
@@ -167,53 +308,75 @@ class EnhancedTableExtractor:
             logger.error(f"Error extracting from DOCX: {e}")
             return []
 
-    def extract_table_text_from_docx_table(self, table: DocxTable) -> List[str]:
-        """Extract text content from a DOCX table"""
-        text_lines = []
-        
-        for row in table.rows:
-            row_text = []
-            for cell in row.cells:
-                cell_text = cell.text.strip()
-                if cell_text:
-                    row_text.append(cell_text)
-            
-            if row_text:
-                text_lines.append(" ".join(row_text))
+    def build_header_automaton(self, headers_by_rank: List[List[str]]):
+        """Build an Aho-Corasick automaton mapping headers to table type rank (None if pyahocorasick is missing)"""
+        try:
+            import ahocorasick
+        except ImportError:
+            logger.debug("pyahocorasick not available, using per-table header regexes")
+            return None
         
-        return text_lines
+        automaton = ahocorasick.Automaton()
+        for rank, headers in enumerate(headers_by_rank):
+            for header in headers:
+                # A header shared by several types belongs to the first (highest priority) one
+                if not automaton.exists(header):
+                    automaton.add_word(header, rank)
+        automaton.make_automaton()
+        return automaton
 
-    def identify_table_type(self, table_text: List[str]) -> Optional[TableType]:
-        """Identify table type from text content"""
-        full_text = " ".join(table_text).lower()
-        
-        for table_type, patterns in self.table_patterns.items():
-            # Check Japanese headers
-            for header in patterns['japanese_headers']:
-                if header in full_text:
-                    return table_type
-            
-            # Check English headers
-            for header in patterns['english_headers']:
-                if header.lower() in full_text:
-                    return table_type
+    def best_header_rank(self, text: str, automaton, patterns: List[re.Pattern], limit: int) -> Optional[int]:
+        """Highest priority table type rank below limit with a header in text"""
+        if automaton is not None:
+            # One pass reports every (overlapping) header hit; keep the earliest type
+            best = None
+            for _, rank in automaton.iter(text):
+                if rank < limit and (best is None or rank < best):
+                    best = rank
+                    if rank == 0:
+                        break
+            return best
+        
+        for rank, pattern in enumerate(patterns[:limit]):
+            if pattern.search(text):
+                return rank
         
         return None
 
-    def parse_docx_table(self, table: DocxTable, table_type: TableType, page_number: int) -> Optional[TableData]:
-        """Parse a DOCX table into structured data"""
+    def identify_table_type(self, rows: List[List[str]]) -> Optional[TableType]:
+        """Identify table type from the table's cell text"""
+        return self.match_table_type(" ".join(cell for row in rows for cell in row if cell))
+
+    def match_table_type(self, raw_text: str) -> Optional[TableType]:
+        """Table type whose headers occur in the joined table text"""
+        # Table types are checked in priority order, Japanese and English headers together.
+        # Japanese headers are caseless, so a first-type Japanese hit skips lowercasing
+        rank = self.best_header_rank(raw_text, self.japanese_header_automaton,
+                                     self.japanese_header_patterns, len(self.table_types))
+        if rank != 0:
+            # English headers only matter for types ahead of any Japanese match
+            limit = len(self.table_types) if rank is None else rank
+            english_rank = self.best_header_rank(raw_text.lower(), self.english_header_automaton,
+                                                 self.english_header_patterns, limit)
+            if english_rank is not None:
+                rank = english_rank
+        
+        return self.table_types[rank] if rank is not None else None
+
+    def parse_docx_table(self, rows: List[List[str]], table_type: TableType, page_number: int) -> Optional[TableData]:
+        """Parse a DOCX table's rows into structured data"""
         try:
             rows_data = []
-            categories_found = []
+            categories_found = {}  # insertion-ordered set
             
-            # Extract table data row by row
-            for row_idx, row in enumerate(table.rows):
-                row_cells = [cell.text.strip() for cell in row.cells]
-                
-                # Skip header rows
-                if row_idx < 2:
-                    continue
-                
+            # Each expected category has one Sales/Purchases/Total row; once all of them
+            # are in, the remaining rows are notes or footers
+            missing_rows = {(category, transaction_type)
+                            for category in self.table_patterns[table_type]['expected_categories']
+                            for transaction_type in self.transaction_mappings.values()}
+            
+            # Extract table data row by row, skipping the two header rows
+            for row_cells in rows[2:]:
                 # Look for category and transaction data
                 if len(row_cells) >= 6:  # Minimum columns for data rows
                     parsed_row = self.parse_table_row(row_cells, table_type)
@@ -222,15 +385,19 @@ class EnhancedTableExtractor:
                         
                         # Track categories
                         category = parsed_row.get('Category')
-                        if category and category not in categories_found:
-                            categories_found.append(category)
+                        if category:
+                            categories_found[category] = None
+                        
+                        missing_rows.discard((category, parsed_row['Transaction_Type']))
+                        if not missing_rows:
+                            break
             
             if rows_data:
                 return TableData(
                     table_type=table_type,
                     page_number=page_number,
                     data=rows_data,
-                    categories_found=categories_found,
+                    categories_found=list(categories_found),
                     expected_rows=self.table_patterns[table_type]['expected_rows'],
                     actual_rows=len(rows_data),
                     extraction_method="docx",
@@ -243,37 +410,48 @@ class EnhancedTableExtractor:
             logger.error(f"Error parsing DOCX table: {e}")
             return None
 
+    def build_term_matcher(self, terms_by_rank: List[List[Tuple[str, str]]]) -> Tuple[re.Pattern, Dict[str, Tuple[int, str]]]:
+        """Compile (term, value) groups in priority order into a lookahead pattern and a term lookup"""
+        priorities = {}
+        for rank, terms in enumerate(terms_by_rank):
+            for term, value in terms:
+                priorities.setdefault(term, (rank, value))
+        # The zero-width lookahead reports a match at every position, so overlapping
+        # occurrences are not hidden behind an earlier match
+        pattern = re.compile('(?=(' + '|'.join(re.escape(term) for term in priorities) + '))')
+        return pattern, priorities
+
+    def find_listed_term(self, matcher: Tuple[re.Pattern, Dict[str, Tuple[int, str]]], text: str) -> Optional[str]:
+        """Value of the highest priority term occurring in text"""
+        pattern, priorities = matcher
+        best = None
+        for match in pattern.finditer(text):
+            rank, value = priorities[match.group(1)]
+            if best is None or rank < best[0]:
+                best = (rank, value)
+                if rank == 0:
+                    break
+        return best[1] if best else None
+
     def parse_table_row(self, row_cells: List[str], table_type: TableType) -> Optional[Dict[str, Any]]:
         """Parse a single table row into structured data"""
         if len(row_cells) < 6:
             return None
         
-        # Identify category
-        category = None
-        transaction_type = None
-        
-        # Look for Japanese category names
-        expected_categories = self.table_patterns[table_type]['expected_categories']
-        for cat in expected_categories:
-            if any(cat in cell for cell in row_cells):
-                category = cat
-                break
+        # Cells are joined with \x1f, which no category, transaction name or number contains,
+        # so every match stays within a single cell
+        row_text = '\x1f'.join(row_cells)
         
-        # Look for transaction type
-        for jp_trans, en_trans in self.transaction_mappings.items():
-            if any(jp_trans in cell or en_trans in cell for cell in row_cells):
-                transaction_type = en_trans
-                break
+        # Identify category (Japanese names, first expected category wins) and transaction
+        # type (Japanese or English name, first mapping wins)
+        category = self.find_listed_term(self.category_matchers[table_type], row_text)
+        transaction_type = self.find_listed_term(self.transaction_matcher, row_text)
         
         if not category or not transaction_type:
             return None
         
-        # Extract numerical data
-        numbers = []
-        for cell in row_cells:
-            # Extract numbers (with commas, decimals, and negative signs)
-            number_matches = re.findall(r'[▲]?[0-9,]+(?:\.[0-9]+)?', cell)
-            numbers.extend(number_matches)
+        # Extract numerical data (with commas, decimals, and negative signs) in one scan per row
+        numbers = _NUMBER_RE.findall(row_text)
         
         if len(numbers) >= 4:
             return {
@@ -298,16 +476,24 @@ class EnhancedTableExtractor:
         actual_rows = len(data)
         expected_categories = self.table_patterns[table_type]['expected_categories']
         
+        # Category coverage and data completeness counted in one pass over the rows
+        found_categories = set()
+        complete_rows = 0
+        for row in data:
+            category = row.get('Category')
+            if category:
+                found_categories.add(category)
+                if row.get('Transaction_Type') and row.get('Trading Volume Volume') and row.get('Trading Value Value'):
+                    complete_rows += 1
+        
         # Score based on row count match
         row_score = min(actual_rows / expected_rows, 1.0)
         
         # Score based on category coverage
-        found_categories = set(row['Category'] for row in data if row.get('Category'))
         category_score = len(found_categories) / len(expected_categories)
         
         # Score based on data completeness
-        complete_rows = sum(1 for row in data if all(row.get(key) for key in ['Category', 'Transaction_Type', 'Trading Volume Volume', 'Trading Value Value']))
-        completeness_score = complete_rows / len(data) if data else 0
+        completeness_score = complete_rows / actual_rows
         
         return (row_score + category_score + completeness_score) / 3
 
@@ -360,19 +546,22 @@ class EnhancedTableExtractor:
         
         all_results = {}
         
-        for pdf_file in pdf_files:
-            logger.info(f"Processing: {pdf_file.name}")
-            try:
-                tables_data = self.extract_with_fallback(pdf_file)
-                if tables_data:
-                    all_results[pdf_file.name] = tables_data
-                    logger.info(f"Extracted {len(tables_data)} tables from {pdf_file.name}")
-                else:
-                    logger.warning(f"No tables extracted from {pdf_file.name}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing {pdf_file.name}: {e}")
-                continue
+        # Files are independent, so conversion and extraction run in worker processes;
+        # the Excel workbook and report are still written here from the collected results
+        max_workers = min(self.max_workers, len(pdf_files))
+        if max_workers <= 1:
+            results = [_process_one(pdf_file, self.output_folder) for pdf_file in pdf_files]
+        else:
+            logger.info(f"Processing {len(pdf_files)} PDFs with {max_workers} workers")
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(partial(_process_one, output_folder=self.output_folder), pdf_files))
+        
+        for name, tables_data in results:
+            if tables_data:
+                all_results[name] = tables_data
+                logger.info(f"Extracted {len(tables_data)} tables from {name}")
+            else:
+                logger.warning(f"No tables extracted from {name}")
         
         if all_results:
             self.save_to_excel(all_results)
@@ -384,8 +573,8 @@ class EnhancedTableExtractor:
         """Save extracted data to Excel with improved formatting"""
         excel_path = self.output_folder / "enhanced_extraction_results.xlsx"
         
-        wb = Workbook()
-        wb.remove(wb.active)  # Remove default sheet
+        # Write-only mode streams each row to disk; sheets are written in creation order
+        wb = Workbook(write_only=True)
         
         # Summary data
         summary_data = {
@@ -408,90 +597,72 @@ class EnhancedTableExtractor:
                 sheet_name = f"P{table_data.page_number}_{table_data.table_type.value}"
                 ws = wb.create_sheet(title=sheet_name)
                 self.populate_data_sheet(ws, table_data, filename)
+                ws.close()  # flush the finished sheet now instead of at save time
         
         wb.save(excel_path)
         logger.info(f"Enhanced results saved to {excel_path}")
 
     def create_summary_sheet(self, wb: Workbook, summary_data: Dict, all_results: Dict) -> None:
         """Create comprehensive summary sheet"""
-        ws = wb.create_sheet(title="Enhanced_Summary", index=0)
+        ws = wb.create_sheet(title="Enhanced_Summary")
         
         # Headers
-        ws['A1'] = "Enhanced Multi-Table Extraction Report"
-        ws['A1'].font = Font(size=16, bold=True)
+        ws.append(self.styled_row(ws, ["Enhanced Multi-Table Extraction Report"], font=_TITLE_FONT))
+        ws.append([])
         
         # Summary statistics
-        ws['A3'] = "Extraction Summary"
-        ws['A3'].font = Font(bold=True)
-        
-        ws['A4'] = "Total Files Processed:"
-        ws['B4'] = summary_data['total_files']
-        ws['A5'] = "Total Tables Extracted:"
-        ws['B5'] = summary_data['total_tables']
-        ws['A6'] = "Average Confidence Score:"
-        ws['B6'] = f"{summary_data['avg_confidence']:.2f}"
+        ws.append(self.styled_row(ws, ["Extraction Summary"]))
+        ws.append(["Total Files Processed:", summary_data['total_files']])
+        ws.append(["Total Tables Extracted:", summary_data['total_tables']])
+        ws.append(["Average Confidence Score:", f"{summary_data['avg_confidence']:.2f}"])
+        ws.append([])
         
         # Detailed breakdown
-        row = 8
-        ws[f'A{row}'] = "File-by-File Results:"
-        ws[f'A{row}'].font = Font(bold=True)
-        row += 1
+        ws.append(self.styled_row(ws, ["File-by-File Results:"]))
         
         for filename, tables in all_results.items():
-            ws[f'A{row}'] = filename
-            ws[f'B{row}'] = f"{len(tables)} tables"
             avg_conf = sum(t.confidence_score for t in tables) / len(tables) if tables else 0
-            ws[f'C{row}'] = f"{avg_conf:.2f} confidence"
-            row += 1
+            ws.append([filename, f"{len(tables)} tables", f"{avg_conf:.2f} confidence"])
+        
+        ws.close()
 
     def populate_data_sheet(self, ws, table_data: TableData, filename: str) -> None:
         """Populate individual data sheet with enhanced metadata"""
-        # Metadata section
-        ws['A1'] = f"File: {filename}"
-        ws['A2'] = f"Page: {table_data.page_number}"
-        ws['A3'] = f"Table: {table_data.table_type.value}"
-        ws['A4'] = f"Extraction Method: {table_data.extraction_method}"
-        ws['A5'] = f"Confidence Score: {table_data.confidence_score:.2f}"
-        ws['A6'] = f"Expected Rows: {table_data.expected_rows}"
-        ws['A7'] = f"Actual Rows: {table_data.actual_rows}"
-        ws['A8'] = f"Categories Found: {', '.join(table_data.categories_found)}"
-        
-        # Data section
+        # Metadata section (rows 1-8, bold)
+        metadata = [
+            f"File: {filename}",
+            f"Page: {table_data.page_number}",
+            f"Table: {table_data.table_type.value}",
+            f"Extraction Method: {table_data.extraction_method}",
+            f"Confidence Score: {table_data.confidence_score:.2f}",
+            f"Expected Rows: {table_data.expected_rows}",
+            f"Actual Rows: {table_data.actual_rows}",
+            f"Categories Found: {', '.join(table_data.categories_found)}",
+        ]
+        for line in metadata:
+            ws.append(self.styled_row(ws, [line]))
+        
+        # Data section: column headers on row 10, then one appended row per record
         if table_data.data:
-            df = pd.DataFrame(table_data.data)
-            
-            # Add column headers
-            start_row = 10
-            for col_num, column_name in enumerate(df.columns, 1):
-                ws.cell(row=start_row, column=col_num, value=column_name)
-            
-            # Add data rows
-            for row_num, row_data in enumerate(df.values, start_row + 1):
-                for col_num, cell_value in enumerate(row_data, 1):
-                    ws.cell(row=row_num, column=col_num, value=cell_value)
-        
-        # Apply formatting
-        self.apply_enhanced_formatting(ws)
-
-    def apply_enhanced_formatting(self, ws) -> None:
-        """Apply enhanced formatting to worksheet"""
-        # Header formatting
-        header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        header_font = Font(color='FFFFFF', bold=True)
-        
-        # Metadata formatting
-        for row in ws[1:8]:
-            for cell in row:
-                if cell.value:
-                    cell.font = Font(bold=True)
-        
-        # Column header formatting
-        if ws.max_row >= 10:
-            for cell in ws[10]:
-                if cell.value:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal='center')
+            columns = list(dict.fromkeys(key for row in table_data.data for key in row))
+            ws.append([])
+            ws.append(self.styled_row(ws, columns, font=_HEADER_FONT, fill=_HEADER_FILL, alignment=_HEADER_ALIGNMENT))
+            for row in table_data.data:
+                ws.append([row.get(column) for column in columns])
+
+    def styled_row(self, ws, values, font=_BOLD, fill=None, alignment=None) -> List[Any]:
+        """Wrap row values in formatted write-only cells (empty values stay unstyled)"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            if value:
+                cell.font = font
+                if fill is not None:
+                    cell.fill = fill
+                if alignment is not None:
+                    cell.alignment = alignment
+            cells.append(cell)
+        return cells
 
     def generate_comparison_report(self, all_results: Dict[str, List[TableData]]) -> None:
         """Generate comparison report between extraction methods"""
@@ -518,6 +689,18 @@ class EnhancedTableExtractor:
         logger.info(f"Quality report saved to {report_path}")
 
 
+def _process_one(pdf_path: Path, output_folder: Path) -> Tuple[str, List[TableData]]:
+    """Convert and extract a single PDF (worker process entry point)"""
+    logger.info(f"Processing: {pdf_path.name}")
+    try:
+        extractor = EnhancedTableExtractor(input_folder=str(pdf_path.parent), output_folder=str(output_folder),
+                                           max_workers=1)
+        return pdf_path.name, extractor.extract_with_fallback(pdf_path)
+    except Exception as e:
+        logger.error(f"Error processing {pdf_path.name}: {e}")
+        return pdf_path.name, []
+
+
 def main():
     """Main execution function"""
     print("🚀 Enhanced Multi-Table Extractor with PDF→DOCX Conversion")
@@ -7,18 +7,21 @@ while maintaining perfect quality results
 
 import os
 import sys
-import multiprocessing
+import zipfile
 from pathlib import Path
 import logging
 from typing import Optional, List, Tuple
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 import time
 
 try:
     from pdf2docx import Converter
-    from docx import Document
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import qn
+    from lxml import etree
     from openpyxl import Workbook
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.cell import WriteOnlyCell
 except ImportError as e:
     print(f"Missing required packages. Install with:")
     print("pip install pdf2docx python-docx openpyxl")
@@ -28,10 +31,71 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Shared cell styles for the write-only workbooks
+_BOLD = Font(bold=True)
+_TITLE_FONT = Font(size=16, bold=True)
+_HEADER_FILL = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+
+# Clark-notation WordprocessingML tag names for reading document.xml directly
+W_P, W_R, W_T, W_BR, W_CR, W_TAB = qn('w:p'), qn('w:r'), qn('w:t'), qn('w:br'), qn('w:cr'), qn('w:tab')
+W_TYPE = qn('w:type')
+W_BODY, W_TBL = qn('w:body'), qn('w:tbl')
+
+
+def available_cpu_count() -> int:
+    """CPUs this process may run on (honours taskset/cpuset limits), else the machine's count"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on Windows/macOS
+        return os.cpu_count() or 1
+
+
+def cell_text(tc) -> str:
+    """Text of a <w:tc> as python-docx's cell.text renders it, read in one lxml pass"""
+    parts = []
+    for index, p in enumerate(tc.iterchildren(W_P)):
+        if index:
+            parts.append('\n')
+        for node in p.iter(W_T, W_BR, W_CR, W_TAB):
+            if node.tag == W_T:
+                parts.append(node.text or '')
+            elif node.getparent().tag != W_R:
+                continue  # tab stops in paragraph properties
+            elif node.tag == W_TAB:
+                parts.append('\t')
+            elif node.tag == W_CR or node.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+    return ''.join(parts)
+
+
+def table_rows_text(tbl):
+    """Yield stripped cell text per row of a <w:tbl>, expanding merged cells like python-docx's row.cells"""
+    # Each <w:tc> is read once: horizontal spans repeat the value across the spanned
+    # columns and vertical merge continuations reuse the value from the row above
+    text_of = cell_text  # local lookup in the per-cell loop
+    above = {}
+    for tr in tbl.tr_lst:
+        row_values = []
+        current = {}
+        grid_offset = tr.grid_before
+        for tc in tr.tc_lst:
+            span = tc.grid_span
+            if tc.vMerge == 'continue' and grid_offset in above:
+                value, span = above[grid_offset]
+            else:
+                value = text_of(tc).strip()
+            current[grid_offset] = (value, span)
+            row_values.extend([value] * span)
+            grid_offset += span
+        above = current
+        yield row_values
+
+
 class FastParallelConverter:
     """Fast parallel PDF→DOCX→Excel converter with multi-core processing"""
     
-    def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data"):
+    def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data",
+                 pdf_cpu_count: Optional[int] = None):
         self.input_folder = Path(input_folder)
         self.output_folder = Path(output_folder)
         self.docx_folder = self.output_folder / "converted_docx"
@@ -49,8 +113,11 @@ class FastParallelConverter:
         ]
         
         # Get optimal number of CPU cores
-        self.cpu_cores = multiprocessing.cpu_count()
+        self.cpu_cores = available_cpu_count()
         logger.info(f"🚀 Using {self.cpu_cores} CPU cores for parallel processing")
+        
+        # pdf2docx page-level workers per PDF (leave one core free, 1 = single process)
+        self.pdf_cpu_count = pdf_cpu_count or max(1, self.cpu_cores - 1)
 
     def process_all_files(self):
         """Process all PDF files through the fast parallel pipeline"""
@@ -59,8 +126,15 @@ class FastParallelConverter:
             print(f"❌ Please create '{self.input_folder}' folder and place your PDF files there.")
             return
         
-        pdf_files = list(self.input_folder.glob("*.pdf"))
-        docx_files = list(self.input_folder.glob("*.docx"))
+        # One directory pass for both file types (DirEntry carries the file type, no extra stat)
+        pdf_files = []
+        docx_files = []
+        with os.scandir(self.input_folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(".pdf") and entry.is_file():
+                    pdf_files.append(Path(entry.path))
+                elif entry.name.endswith(".docx") and entry.is_file():
+                    docx_files.append(Path(entry.path))
         
         if not pdf_files and not docx_files:
             logger.error(f"No PDF or DOCX files found in '{self.input_folder}'")
@@ -70,14 +144,27 @@ class FastParallelConverter:
         print(f"📁 Found {len(pdf_files)} PDF files and {len(docx_files)} DOCX files")
         print(f"⚡ Fast parallel processing mode activated!")
         
-        # Process PDF files with fast conversion
-        for pdf_file in pdf_files:
+        # Process PDF files with fast conversion; each PDF is an independent CPU-bound
+        # pdf2docx job, so they are converted side by side in worker processes
+        if pdf_files:
             start_time = time.time()
-            logger.info(f"🚀 Processing PDF: {pdf_file.name}")
+            max_workers = min(self.cpu_cores, len(pdf_files))
             
-            docx_path = self.fast_convert_pdf_to_docx(pdf_file)
-            if docx_path:
-                self.fast_convert_docx_to_excel(docx_path, source_type="PDF")
+            if max_workers <= 1:
+                # A lone conversion gets pdf2docx's own page-level multi-processing instead
+                self.excel_from_converted(map(self.convert_one, pdf_files))
+            else:
+                # pdf2docx multi-processing writes pages-N.json into the working directory,
+                # so conversions running side by side each use a single process. Each worker
+                # builds its converter once and reuses it for every PDF it is handed
+                logger.info(f"🚀 Converting {len(pdf_files)} PDFs with {max_workers} workers")
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                         initargs=(str(self.input_folder), str(self.output_folder))) as executor:
+                    # Results are consumed as they arrive, so each DOCX's Excel extraction and
+                    # save run here while the pool is still converting the remaining PDFs. The
+                    # pool already has the cores, and forking while its threads run is unsafe,
+                    # so extraction stays in this process
+                    self.excel_from_converted(executor.map(_convert_one, pdf_files), extraction_workers=1)
             
             elapsed_time = time.time() - start_time
             print(f"⏱️ Total processing time: {elapsed_time:.2f} seconds")
@@ -92,6 +179,19 @@ class FastParallelConverter:
             elapsed_time = time.time() - start_time
             print(f"⏱️ DOCX processing time: {elapsed_time:.2f} seconds")
 
+    def excel_from_converted(self, docx_paths, extraction_workers: Optional[int] = None) -> None:
+        """Extract Excel from each converted DOCX as soon as its conversion is done"""
+        # Excel extraction may run its own process pool per document, so it stays in this process
+        for docx_path in docx_paths:
+            if docx_path:
+                self.fast_convert_docx_to_excel(docx_path, source_type="PDF",
+                                                extraction_workers=extraction_workers)
+
+    def convert_one(self, pdf_path: Path) -> Optional[Path]:
+        """Convert a single PDF to DOCX"""
+        logger.info(f"🚀 Processing PDF: {pdf_path.name}")
+        return self.fast_convert_pdf_to_docx(pdf_path)
+
     def fast_convert_pdf_to_docx(self, pdf_path: Path) -> Optional[Path]:
         """Fast PDF to DOCX conversion with optimized settings"""
         docx_path = self.docx_folder / f"{pdf_path.stem}.docx"
@@ -104,33 +204,10 @@ class FastParallelConverter:
             logger.info(f"⚡ Fast converting {pdf_path.name} to DOCX...")
             conversion_start = time.time()
             
-            # Use pdf2docx with optimized settings for speed
+            # Use pdf2docx with its page-level multi-processing for speed
             cv = Converter(str(pdf_path))
-            
-            # Fast conversion settings
-            cv.convert(
-                str(docx_path), 
-                start=0, 
-                end=None,
-                # Speed optimization parameters
-                pages=None,  # Process all pages
-                password=None,
-                # Table-focused settings for faster processing
-                table_settings={
-                    'border_color': (0, 0, 0),  # Skip complex border analysis
-                    'snap_tolerance': 1.0,      # Faster table detection
-                    'min_border_width': 0.5     # Skip thin borders for speed
-                },
-                # Layout optimization
-                layout_settings={
-                    'page_width': None,         # Skip page width analysis
-                    'page_height': None,        # Skip page height analysis
-                    'margin_left': None,        # Skip margin calculations
-                    'margin_right': None,
-                    'margin_top': None,
-                    'margin_bottom': None
-                }
-            )
+            cv.convert(str(docx_path), start=0, end=None,
+                       multi_processing=self.pdf_cpu_count > 1, cpu_count=self.pdf_cpu_count)
             cv.close()
             
             conversion_time = time.time() - conversion_start
@@ -140,33 +217,19 @@ class FastParallelConverter:
             
         except Exception as e:
             logger.error(f"❌ Fast PDF conversion failed for {pdf_path.name}: {e}")
-            # Fallback to standard conversion if fast conversion fails
-            return self.fallback_convert_pdf_to_docx(pdf_path)
-
-    def fallback_convert_pdf_to_docx(self, pdf_path: Path) -> Optional[Path]:
-        """Fallback to standard conversion if fast conversion fails"""
-        docx_path = self.docx_folder / f"{pdf_path.stem}_fallback.docx"
-        
-        try:
-            logger.info(f"🔄 Using fallback conversion for {pdf_path.name}...")
-            
-            cv = Converter(str(pdf_path))
-            cv.convert(str(docx_path), start=0, end=None)
-            cv.close()
-            
-            logger.info(f"✅ Fallback conversion successful")
-            return docx_path
-            
-        except Exception as e:
-            logger.error(f"❌ Fallback conversion also failed: {e}")
+            # Don't leave a partial DOCX behind for the "already exists" check to pick up
+            docx_path.unlink(missing_ok=True)
             return None
 
-    def fast_convert_docx_to_excel(self, docx_path: Path, source_type: str = "DOCX"):
-        """Fast DOCX to Excel conversion using parallel processing"""
+    def fast_convert_docx_to_excel(self, docx_path: Path, source_type: str = "DOCX",
+                                   extraction_workers: Optional[int] = None):
+        """Fast DOCX to Excel conversion using parallel processing (extraction_workers caps the pool)"""
         try:
-            # Open DOCX document
-            doc = Document(docx_path)
-            total_tables = len(doc.tables)
+            # Parse word/document.xml once; workers only ever see their own tables' XML
+            with zipfile.ZipFile(docx_path) as docx_zip:
+                body = parse_xml(docx_zip.read('word/document.xml')).find(W_BODY)
+            tables = body.findall(W_TBL)
+            total_tables = len(tables)
             logger.info(f"📊 Found {total_tables} tables in {docx_path.name}")
             
             if total_tables == 0:
@@ -175,45 +238,40 @@ class FastParallelConverter:
             
             extraction_start = time.time()
             
-            # Create Excel workbook
-            wb = Workbook()
-            wb.remove(wb.active)  # Remove default sheet
+            # Create Excel workbook (write-only: rows are streamed, no in-memory cell grid)
+            wb = Workbook(write_only=True)
             
-            # Create summary sheet first
-            self.create_summary_sheet(wb, total_tables, docx_path.name, source_type)
+            # Create summary sheet first; its table index is filled in as the sheets are written
+            summary_ws = self.create_summary_sheet(wb, total_tables, docx_path.name, source_type)
             
             # Fast parallel table processing
             logger.info(f"⚡ Starting parallel table extraction...")
             
-            # Use ThreadPoolExecutor for I/O-bound Excel operations
-            with ThreadPoolExecutor(max_workers=min(self.cpu_cores, 8)) as executor:
-                # Process tables in parallel batches
-                batch_size = max(1, total_tables // self.cpu_cores)
-                
-                # Submit all table processing tasks
-                futures = []
-                for i in range(0, total_tables, batch_size):
-                    batch_end = min(i + batch_size, total_tables)
-                    batch_tables = doc.tables[i:batch_end]
-                    
-                    # Submit batch for processing
-                    future = executor.submit(
-                        self.process_table_batch, 
-                        batch_tables, 
-                        i, 
-                        docx_path.name,
-                        wb
-                    )
-                    futures.append(future)
-                
-                # Wait for all batches to complete
-                for future in futures:
-                    future.result()
+            max_workers = min(extraction_workers or self.cpu_cores, 8, total_tables)
+            
+            if max_workers <= 1:
+                self.process_tables(wb, summary_ws, map(_table_data, tables), docx_path.name)
+            else:
+                # Cell text extraction is CPU-bound (GIL-held XML walking), so it runs in worker
+                # processes; the workbook is only touched here, sheet by sheet in table order.
+                # Workers get just the <w:tbl> XML instead of reparsing the DOCX, one table per
+                # task in chunks of ~1/4 of a worker's share so no core idles on a long tail
+                chunksize = max(1, total_tables // (4 * max_workers))
+                tables_xml = [etree.tostring(tbl) for tbl in tables]
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    self.process_tables(wb, summary_ws, executor.map(_extract_table, tables_xml, chunksize=chunksize),
+                                        docx_path.name)
             
             # Save Excel file
             excel_filename = f"{docx_path.stem}_extracted.xlsx"
             excel_path = self.output_folder / excel_filename
-            wb.save(excel_path)
+            # Write beside the target and rename, so a crash never leaves a truncated xlsx behind
+            part_path = excel_path.with_suffix('.xlsx.part')
+            try:
+                wb.save(part_path)
+                os.replace(part_path, excel_path)
+            finally:
+                part_path.unlink(missing_ok=True)
             
             extraction_time = time.time() - extraction_start
             
@@ -232,11 +290,9 @@ class FastParallelConverter:
         except Exception as e:
             logger.error(f"❌ Error in fast processing {docx_path.name}: {e}")
 
-    def process_table_batch(self, tables: List, start_index: int, filename: str, wb: Workbook) -> None:
-        """Process a batch of tables in parallel"""
-        for i, table in enumerate(tables):
-            table_index = start_index + i
-            
+    def process_tables(self, wb: Workbook, summary_ws, tables, filename: str) -> None:
+        """Write extracted tables, in document order, to their own sheets and index them in the summary"""
+        for table_index, table in enumerate(tables):
             # Calculate page and table position
             page_number = (table_index // 4) + 1
             table_position = table_index % 4
@@ -245,80 +301,105 @@ class FastParallelConverter:
             # Create sheet name (shortened to fit Excel limit)
             sheet_name = f"P{page_number}_{table_name[:20]}"
             
-            # Create worksheet (thread-safe)
+            # Create worksheet
             ws = wb.create_sheet(title=sheet_name)
             
             # Copy table data directly
-            self.copy_table_to_sheet(table, ws, filename, page_number, table_name)
+            self.copy_table_to_sheet(table, ws)
+            
+            # Table metadata lives once in the summary's index rather than atop every sheet
+            num_rows, num_cols, _ = table
+            summary_ws.append([sheet_name, filename, page_number, num_rows, num_cols])
 
-    def copy_table_to_sheet(self, table, ws, filename, page_number, table_name):
+    def copy_table_to_sheet(self, table, ws):
         """Fast table copying with minimal processing"""
-        # Add metadata (minimal)
-        ws['A1'] = f"Source: {filename}"
-        ws['A2'] = f"Page: {page_number}"
-        ws['A3'] = f"Table: {table_name}"
-        ws['A4'] = f"Rows: {len(table.rows)}"
-        ws['A5'] = f"Columns: {len(table.columns) if table.rows else 0}"
-        
-        # Fast table copying starting from row 7
-        start_row = 7
+        _, _, table_data = table
         
-        # Bulk copy all cells at once (faster than cell-by-cell)
-        table_data = []
-        for table_row in table.rows:
-            row_data = [cell.text.strip() for cell in table_row.cells]
-            table_data.append(row_data)
-        
-        # Write all data at once
+        # Fast table copying starting from row 1, one appended row per table row
         for row_index, row_data in enumerate(table_data):
-            excel_row = start_row + row_index
-            for col_index, cell_value in enumerate(row_data):
-                ws.cell(row=excel_row, column=col_index + 1, value=cell_value)
-        
-        # Minimal formatting for speed
-        self.apply_fast_formatting(ws, start_row, len(table_data))
-
-    def apply_fast_formatting(self, ws, start_row, num_rows):
-        """Apply minimal formatting for maximum speed"""
-        # Format metadata only
-        for row_num in range(1, 6):
-            cell = ws.cell(row=row_num, column=1)
-            if cell.value:
-                cell.font = Font(bold=True)
-        
-        # Format header row only
-        if num_rows > 0:
-            for col_num in range(1, 9):  # Assume max 8 columns
-                cell = ws.cell(row=start_row, column=col_num)
-                if cell.value:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+            if row_index == 0:
+                # Header row: bold on a gray fill across all of the table's columns
+                ws.append(self.bold_row(ws, row_data, fill=_HEADER_FILL))
+            else:
+                ws.append(row_data)
+
+    def bold_row(self, ws, values, fill=None):
+        """Wrap row values in bold write-only cells (empty values stay unstyled)"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            if value:
+                cell.font = _BOLD
+                if fill is not None:
+                    cell.fill = fill
+            cells.append(cell)
+        return cells
 
     def create_summary_sheet(self, wb, total_tables, filename, source_type):
         """Create summary sheet with performance info"""
-        ws = wb.create_sheet(title="Summary", index=0)
-        
-        ws['A1'] = "⚡ Fast Parallel PDF→DOCX→Excel Converter"
-        ws['A1'].font = Font(size=16, bold=True)
+        # Created before any table sheet, so it is the first sheet of the write-only workbook
+        ws = wb.create_sheet(title="Summary")
         
-        ws['A3'] = f"Source Type: {source_type}"
-        ws['A4'] = f"Source File: {filename}"
-        ws['A5'] = f"Total Tables: {total_tables}"
-        ws['A6'] = f"CPU Cores Used: {self.cpu_cores}"
-        ws['A7'] = f"Processing Mode: Parallel"
+        title = WriteOnlyCell(ws, value="⚡ Fast Parallel PDF→DOCX→Excel Converter")
+        title.font = _TITLE_FONT
+        ws.append([title])
+        ws.append([])
         
         total_pages = (total_tables + 3) // 4
-        ws['A8'] = f"Total Pages: {total_pages}"
-        ws['A9'] = f"Tables per Page: 4"
-        ws['A10'] = f"Extraction Method: Fast parallel processing"
+        summary_lines = [
+            f"Source Type: {source_type}",
+            f"Source File: {filename}",
+            f"Total Tables: {total_tables}",
+            f"CPU Cores Used: {self.cpu_cores}",
+            f"Processing Mode: Parallel",
+            f"Total Pages: {total_pages}",
+            f"Tables per Page: 4",
+            f"Extraction Method: Fast parallel processing",
+        ]
+        for line in summary_lines:
+            ws.append([line])
+        ws.append([])
         
-        ws['A12'] = "Performance Optimizations:"
-        ws['A12'].font = Font(bold=True)
-        ws['A13'] = "✅ Multi-core parallel processing"
-        ws['A14'] = "✅ Optimized PDF conversion settings"
-        ws['A15'] = "✅ Bulk table data copying"
-        ws['A16'] = "✅ Minimal formatting for speed"
-        ws['A17'] = "✅ Thread-safe Excel operations"
+        ws.append(self.bold_row(ws, ["Performance Optimizations:"]))
+        ws.append(["✅ Multi-core parallel processing"])
+        ws.append(["✅ Optimized PDF conversion settings"])
+        ws.append(["✅ Bulk table data copying"])
+        ws.append(["✅ Minimal formatting for speed"])
+        ws.append(["✅ Thread-safe Excel operations"])
+        ws.append([])
+        
+        # Table index header; process_tables appends one row per sheet below it
+        ws.append(self.bold_row(ws, ["Table Index:"]))
+        ws.append(self.bold_row(ws, ["Sheet", "Source", "Page", "Rows", "Columns"], fill=_HEADER_FILL))
+        return ws
+
+
+# Per-process converter for PDF pool workers, set up once by _init_worker
+_worker_converter = None
+
+
+def _init_worker(input_folder: str, output_folder: str) -> None:
+    """Create the worker's converter (pool initializer), single-process pdf2docx"""
+    global _worker_converter
+    _worker_converter = FastParallelConverter(input_folder, output_folder, pdf_cpu_count=1)
+
+
+def _convert_one(pdf_path: Path) -> Optional[Path]:
+    """Convert a single PDF to DOCX with the worker's converter (worker process entry point)"""
+    return _worker_converter.convert_one(pdf_path)
+
+
+def _table_data(tbl) -> Tuple[int, int, List[Tuple[str, ...]]]:
+    """Read a <w:tbl> element as (rows, columns, cell text rows)"""
+    # Cell text comes straight from the XML rather than through python-docx's Table/_Cell objects
+    table_data = list(map(tuple, table_rows_text(tbl)))
+    num_cols = len(tbl.tblGrid.gridCol_lst) if table_data else 0
+    return len(table_data), num_cols, table_data
+
+
+def _extract_table(tbl_xml: bytes) -> Tuple[int, int, List[Tuple[str, ...]]]:
+    """Read a serialized <w:tbl> element as (rows, columns, cell text rows) (worker process entry point)"""
+    return _table_data(parse_xml(tbl_xml))
 
 
 def main():
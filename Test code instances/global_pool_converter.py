@@ -8,24 +8,32 @@ Each PDF gets its own Excel file with perfect table preservation
 import os
 import sys
 import multiprocessing
+import multiprocessing.util
 from pathlib import Path
 import logging
 from typing import Optional, List, Tuple, Dict, Any
 import time
 import tempfile
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import shutil
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import functools
+import itertools
 from dataclasses import dataclass
 from queue import Queue
 import threading
+from contextlib import contextmanager
 
 try:
     from pdf2docx import Converter
-    from docx import Document
     from docx.shared import Inches
+    from docx.opc import phys_pkg as docx_phys_pkg
+    from docx.oxml import parse_xml
     from docx.oxml.shared import OxmlElement, qn
+    from lxml import etree
     from openpyxl import Workbook
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.cell import WriteOnlyCell
 except ImportError as e:
     print(f"Missing required packages. Install with:")
     print("pip install pdf2docx python-docx openpyxl")
@@ -35,6 +43,61 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Shared cell styles for the write-only workbooks
+_BOLD = Font(bold=True)
+_TITLE_FONT = Font(size=16, bold=True)
+_HEADER_FILL = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+
+# WordprocessingML parts and tags used when merging chunk documents and reading cells
+DOCUMENT_XML = 'word/document.xml'
+W_BODY, W_SECT_PR, W_TBL = qn('w:body'), qn('w:sectPr'), qn('w:tbl')
+W_P, W_R, W_T, W_BR, W_CR, W_TAB = qn('w:p'), qn('w:r'), qn('w:t'), qn('w:br'), qn('w:cr'), qn('w:tab')
+W_TYPE = qn('w:type')
+
+def cell_text(tc) -> str:
+    """Text of a <w:tc> as python-docx's cell.text renders it, read in one lxml pass"""
+    parts = []
+    for index, p in enumerate(tc.iterchildren(W_P)):
+        if index:
+            parts.append('\n')
+        for node in p.iter(W_T, W_BR, W_CR, W_TAB):
+            if node.tag == W_T:
+                parts.append(node.text or '')
+            elif node.getparent().tag != W_R:
+                continue  # tab stops in paragraph properties
+            elif node.tag == W_TAB:
+                parts.append('\t')
+            elif node.tag == W_CR or node.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+    return ''.join(parts)
+
+def docx_tables(docx_path: Path) -> list:
+    """Body-level <w:tbl> elements of a DOCX (what Document.tables wraps), parsed straight from document.xml"""
+    with zipfile.ZipFile(docx_path) as docx_zip:
+        body = parse_xml(docx_zip.read(DOCUMENT_XML)).find(W_BODY)
+    return body.findall(W_TBL)
+
+def table_rows_text(tbl):
+    """Yield stripped cell text per row of a <w:tbl>, expanding merged cells like python-docx's row.cells"""
+    # Each <w:tc> is read once: horizontal spans repeat the value across the spanned
+    # columns and vertical merge continuations reuse the value from the row above
+    above = {}
+    for tr in tbl.tr_lst:
+        row_values = []
+        current = {}
+        grid_offset = tr.grid_before
+        for tc in tr.tc_lst:
+            span = tc.grid_span
+            if tc.vMerge == 'continue' and grid_offset in above:
+                value, span = above[grid_offset]
+            else:
+                value = cell_text(tc).strip()
+            current[grid_offset] = (value, span)
+            row_values.extend([value] * span)
+            grid_offset += span
+        above = current
+        yield row_values
+
 @dataclass
 class ChunkJob:
     """Represents a chunk processing job"""
@@ -47,6 +110,78 @@ class ChunkJob:
     chunks_folder: Path
     chunk_id: str  # Unique identifier for this chunk
 
+# Per-worker cache of opened PDFs, keyed by (path, mtime), so a worker that gets several
+# chunks of the same PDF parses its object table once. Bounded since every entry keeps
+# its fitz document (and the last chunk's parsed pages) alive
+_CONVERTER_CACHE: Dict[Tuple[str, int], Converter] = {}
+_CONVERTER_CACHE_SIZE = 4
+
+# Per-process GlobalChunkPoolConverter for finalize tasks, set up once by _worker_init
+_worker_converter = None
+
+def _close_cached_converters():
+    """Close every cached Converter's PDF"""
+    for cv in _CONVERTER_CACHE.values():
+        cv.close()
+    _CONVERTER_CACHE.clear()
+
+def _worker_init(output_folder: str, chunk_size: int, max_workers: int):
+    """Pool initializer: the worker's converter for finalize tasks and an empty Converter cache"""
+    global _worker_converter
+    _worker_converter = GlobalChunkPoolConverter.for_finalize(output_folder, chunk_size, max_workers)
+    _CONVERTER_CACHE.clear()
+    # Pool workers leave through os._exit, which skips atexit; multiprocessing finalizers still run
+    multiprocessing.util.Finalize(None, _close_cached_converters, exitpriority=10)
+
+def trailing_section(body):
+    """The body's closing <w:sectPr> (its last child), or None"""
+    if len(body) and body[-1].tag == W_SECT_PR:
+        return body[-1]
+    return None
+
+def page_break_paragraph():
+    """A <w:p> holding a single page break, as Document.add_page_break() writes it"""
+    br = OxmlElement('w:br', {qn('w:type'): 'page'})
+    run = OxmlElement('w:r')
+    run.append(br)
+    paragraph = OxmlElement('w:p')
+    paragraph.append(run)
+    return paragraph
+
+@contextmanager
+def stored_docx_writes():
+    """Have python-docx save packages uncompressed (ZIP_STORED) inside the block"""
+    # python-docx reads its zip compression from this module global on every save
+    deflated = docx_phys_pkg.ZIP_DEFLATED
+    docx_phys_pkg.ZIP_DEFLATED = zipfile.ZIP_STORED
+    try:
+        yield
+    finally:
+        docx_phys_pkg.ZIP_DEFLATED = deflated
+
+def pool_context():
+    """Worker start method that avoids re-importing pdf2docx/docx/openpyxl in every worker"""
+    start_methods = multiprocessing.get_all_start_methods()
+    if sys.platform.startswith('linux') and 'fork' in start_methods:
+        # Workers inherit the parent's already-imported modules copy-on-write
+        return multiprocessing.get_context('fork')
+    if 'forkserver' in start_methods:
+        # fork is unsafe on macOS; the fork server imports these once and forks workers from it
+        ctx = multiprocessing.get_context('forkserver')
+        ctx.set_forkserver_preload(['pdf2docx', 'docx', 'openpyxl', 'fitz'])
+        return ctx
+    return multiprocessing.get_context('spawn')
+
+def get_cached_converter(pdf_path: Path) -> Converter:
+    """Return this process's Converter for pdf_path, opening it on first use"""
+    key = (str(pdf_path), pdf_path.stat().st_mtime_ns)
+    cv = _CONVERTER_CACHE.get(key)
+    if cv is None:
+        if len(_CONVERTER_CACHE) >= _CONVERTER_CACHE_SIZE:
+            _CONVERTER_CACHE.pop(next(iter(_CONVERTER_CACHE))).close()
+        cv = _CONVERTER_CACHE[key] = Converter(str(pdf_path))
+    return cv
+
 def convert_chunk_worker(chunk_job: ChunkJob):
     """Worker function for processing chunks from global pool"""
     chunk_docx_path = chunk_job.chunks_folder / f"{chunk_job.pdf_name}_chunk_{chunk_job.chunk_number}.docx"
@@ -54,24 +189,24 @@ def convert_chunk_worker(chunk_job: ChunkJob):
     try:
         logger.info(f"🔄 Processing {chunk_job.chunk_id}: {chunk_job.pdf_name} pages {chunk_job.start_page + 1}-{chunk_job.end_page}")
         
-        # Convert specific page range
-        cv = Converter(str(chunk_job.pdf_path))
-        cv.convert(
-            str(chunk_docx_path),
-            start=chunk_job.start_page,
-            end=chunk_job.end_page,  # Fixed indexing
-            # Optimized settings for speed while preserving quality
-            table_settings={
-                'snap_tolerance': 1.0,
-                'min_border_width': 0.3,
-                'join_tolerance': 1.0,
-            }
-        )
-        cv.close()
+        # Convert specific page range (Converter reloads its page list on every convert call).
+        # Chunk files are read once by combine_chunks, so they are written without compression
+        cv = get_cached_converter(chunk_job.pdf_path)
+        with stored_docx_writes():
+            cv.convert(
+                str(chunk_docx_path),
+                start=chunk_job.start_page,
+                end=chunk_job.end_page,  # Fixed indexing
+                # Optimized settings for speed while preserving quality
+                table_settings={
+                    'snap_tolerance': 1.0,
+                    'min_border_width': 0.3,
+                    'join_tolerance': 1.0,
+                }
+            )
         
         # Verify chunk
-        chunk_doc = Document(str(chunk_docx_path))
-        chunk_tables = len(chunk_doc.tables)
+        chunk_tables = len(docx_tables(chunk_docx_path))
         expected_tables = (chunk_job.end_page - chunk_job.start_page) * 4
         
         logger.info(f"✅ {chunk_job.chunk_id}: Completed with {chunk_tables}/{expected_tables} tables")
@@ -103,9 +238,21 @@ def convert_chunk_worker(chunk_job: ChunkJob):
             'end_page': chunk_job.end_page
         }
 
+def finalize_pdf_worker(pdf_name: str, results: List[Dict[str, Any]]):
+    """Combine a PDF's chunks and write its Excel file with the worker's converter (worker process entry point)"""
+    return _worker_converter.finalize_pdf(pdf_name, results)
+
 class GlobalChunkPoolConverter:
     """Ultimate converter using global chunk pool for maximum efficiency"""
     
+    # Table names in order (4 per page)
+    TABLE_NAMES = [
+        "Table1_Main_Summary",
+        "Table2_Brokerage_Breakdown", 
+        "Table3_Institutions_Breakdown",
+        "Table4_Financial_Breakdown"
+    ]
+    
     def __init__(self, input_folder: str = "input", output_folder: str = "extracted_data", 
                  chunk_size: int = 6, max_workers: int = 6):
         self.input_folder = Path(input_folder)
@@ -127,13 +274,18 @@ class GlobalChunkPoolConverter:
         logger.info(f"  • Max workers: {max_workers}")
         logger.info(f"  • CPU cores available: {multiprocessing.cpu_count()}")
         
-        # Table names in order (4 per page)
-        self.table_names = [
-            "Table1_Main_Summary",
-            "Table2_Brokerage_Breakdown", 
-            "Table3_Institutions_Breakdown",
-            "Table4_Financial_Breakdown"
-        ]
+        self.table_names = self.TABLE_NAMES
+
+    @classmethod
+    def for_finalize(cls, output_folder: str, chunk_size: int, max_workers: int) -> "GlobalChunkPoolConverter":
+        """Converter with just the settings finalize_pdf uses, skipping __init__'s folder setup and logging"""
+        converter = cls.__new__(cls)
+        converter.output_folder = Path(output_folder)
+        converter.docx_folder = converter.output_folder / "converted_docx"
+        converter.chunk_size = chunk_size
+        converter.max_workers = max_workers
+        converter.table_names = cls.TABLE_NAMES
+        return converter
 
     def process_all_files(self):
         """Process all PDF files using global chunk pool for maximum efficiency"""
@@ -189,6 +341,7 @@ class GlobalChunkPoolConverter:
             pdf_info[pdf_name] = {
                 'pdf_path': pdf_file,
                 'total_pages': total_pages,
+                'bytes_per_page': pdf_file.stat().st_size / max(total_pages, 1),
                 'chunks': []
             }
             
@@ -218,6 +371,13 @@ class GlobalChunkPoolConverter:
             
             logger.info(f"📄 {pdf_name}: {total_pages} pages → {chunk_count} chunks")
         
+        # Longest chunks first (pages × the PDF's bytes per page as the cost estimate), so a
+        # big chunk never starts last and leaves the other workers idle at the end
+        all_chunk_jobs.sort(
+            key=lambda job: (job.end_page - job.start_page) * pdf_info[job.pdf_name]['bytes_per_page'],
+            reverse=True
+        )
+        
         total_chunks = len(all_chunk_jobs)
         logger.info(f"🌐 Global chunk pool created: {total_chunks} chunks from {len(pdf_files)} PDFs")
         
@@ -226,80 +386,66 @@ class GlobalChunkPoolConverter:
         
         logger.info(f"⚡ Starting global pool processing with {self.max_workers} workers...")
         
-        chunk_results = []
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all chunk jobs to global pool
+        # Successful chunk results per PDF, and chunks still outstanding per PDF
+        pdf_results = {}
+        remaining_chunks = {pdf_name: len(info['chunks']) for pdf_name, info in pdf_info.items()}
+        
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=pool_context(),
+                                 initializer=_worker_init,
+                                 initargs=(str(self.output_folder), self.chunk_size, self.max_workers)) as executor:
+            # Keep only one chunk per worker in flight, topped up as each one finishes. The pool
+            # runs tasks in submission order, so a finalize task submitted when a PDF's last chunk
+            # lands then starts next instead of waiting behind every remaining chunk
+            queued_jobs = iter(all_chunk_jobs)
             future_to_chunk = {
-                executor.submit(convert_chunk_worker, chunk_job): chunk_job.chunk_id
-                for chunk_job in all_chunk_jobs
+                executor.submit(convert_chunk_worker, chunk_job): chunk_job
+                for chunk_job in itertools.islice(queued_jobs, self.max_workers)
             }
+            future_to_pdf = {}
             
-            # Collect results as they complete
+            # Collect results as they complete. Once a PDF's last chunk is in, its combine and
+            # Excel step goes into the same pool, overlapping with other PDFs' chunk conversion
             completed_chunks = 0
-            for future in as_completed(future_to_chunk):
-                chunk_id = future_to_chunk[future]
-                try:
-                    result = future.result()
-                    chunk_results.append(result)
-                    completed_chunks += 1
+            pending = set(future_to_chunk)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in future_to_pdf:
+                        self.report_finalized_pdf(future, future_to_pdf[future])
+                        continue
                     
-                    if result['success']:
-                        logger.info(f"✅ {chunk_id} completed ({completed_chunks}/{total_chunks})")
-                    else:
-                        logger.error(f"❌ {chunk_id} failed: {result.get('error', 'Unknown error')}")
-                        
-                except Exception as e:
-                    logger.error(f"❌ {chunk_id} failed with exception: {e}")
-                    chunk_results.append({
-                        'chunk_id': chunk_id,
-                        'success': False,
-                        'error': str(e)
-                    })
+                    chunk_job = future_to_chunk[future]
+                    chunk_id = chunk_job.chunk_id
                     completed_chunks += 1
+                    try:
+                        result = future.result()
+                        
+                        if result['success']:
+                            pdf_results.setdefault(chunk_job.pdf_name, []).append(result)
+                            logger.info(f"✅ {chunk_id} completed ({completed_chunks}/{total_chunks})")
+                        else:
+                            logger.error(f"❌ {chunk_id} failed: {result.get('error', 'Unknown error')}")
+                            
+                    except Exception as e:
+                        logger.error(f"❌ {chunk_id} failed with exception: {e}")
+                    
+                    remaining_chunks[chunk_job.pdf_name] -= 1
+                    if remaining_chunks[chunk_job.pdf_name] == 0 and chunk_job.pdf_name in pdf_results:
+                        finalize_future = executor.submit(finalize_pdf_worker, chunk_job.pdf_name,
+                                                          pdf_results[chunk_job.pdf_name])
+                        future_to_pdf[finalize_future] = chunk_job.pdf_name
+                        pending.add(finalize_future)
+                    
+                    # Refill the window, behind any finalize task just submitted
+                    next_job = next(queued_jobs, None)
+                    if next_job is not None:
+                        next_future = executor.submit(convert_chunk_worker, next_job)
+                        future_to_chunk[next_future] = next_job
+                        pending.add(next_future)
         
         parallel_time = time.time() - conversion_start
         logger.info(f"⚡ Global pool processing completed in {parallel_time:.2f} seconds")
         
-        # Group results by PDF and process each
-        pdf_results = {}
-        for result in chunk_results:
-            if result['success']:
-                pdf_name = result['pdf_name']
-                if pdf_name not in pdf_results:
-                    pdf_results[pdf_name] = []
-                pdf_results[pdf_name].append(result)
-        
-        # Process each PDF's results
-        for pdf_name, results in pdf_results.items():
-            pdf_start = time.time()
-            logger.info(f"🔗 Processing results for {pdf_name} ({len(results)} chunks)")
-            
-            # Sort chunks by number
-            results.sort(key=lambda x: x['chunk_number'])
-            
-            # Combine chunks into DOCX
-            chunk_paths = [result['chunk_path'] for result in results]
-            docx_path = self.docx_folder / f"{pdf_name}.docx"
-            
-            final_docx = self.combine_chunks(chunk_paths, docx_path, pdf_name)
-            
-            if final_docx:
-                # Convert to Excel
-                self.convert_docx_to_excel(final_docx, source_type="PDF_GLOBAL_POOL")
-                
-                pdf_time = time.time() - pdf_start
-                
-                # Verify results
-                final_doc = Document(str(final_docx))
-                final_tables = len(final_doc.tables)
-                expected_total = sum(r['expected_tables'] for r in results)
-                
-                print(f"\n🎉 {pdf_name} COMPLETED:")
-                print(f"  📊 Tables: {final_tables}/{expected_total}")
-                print(f"  📋 Chunks: {len(results)}")
-                print(f"  ⏱️ Processing time: {pdf_time:.2f}s")
-                print(f"  💾 Excel: {pdf_name}_extracted.xlsx")
-        
         total_time = time.time() - start_time
         
         # Print global summary
@@ -312,6 +458,48 @@ class GlobalChunkPoolConverter:
         print(f"  🚀 Average chunks/second: {total_chunks/parallel_time:.1f}")
         print(f"  💾 Excel files created: {len(pdf_results)}")
 
+    def finalize_pdf(self, pdf_name: str, results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Combine one PDF's converted chunks into its DOCX and extract it to Excel"""
+        pdf_start = time.time()
+        logger.info(f"🔗 Processing results for {pdf_name} ({len(results)} chunks)")
+        
+        # Sort chunks by number
+        results.sort(key=lambda x: x['chunk_number'])
+        
+        # Combine chunks into DOCX
+        chunk_paths = [result['chunk_path'] for result in results]
+        docx_path = self.docx_folder / f"{pdf_name}.docx"
+        
+        final_docx = self.combine_chunks(chunk_paths, docx_path, pdf_name)
+        if not final_docx:
+            return None
+        
+        # Convert to Excel (its table count doubles as the verification of the combined DOCX)
+        final_tables = self.convert_docx_to_excel(final_docx, source_type="PDF_GLOBAL_POOL")
+        
+        return {
+            'final_tables': final_tables or 0,
+            'expected_tables': sum(r['expected_tables'] for r in results),
+            'chunks': len(results),
+            'processing_time': time.time() - pdf_start
+        }
+
+    def report_finalized_pdf(self, future, pdf_name: str):
+        """Print the outcome of a PDF's finalize task"""
+        try:
+            summary = future.result()
+        except Exception as e:
+            logger.error(f"❌ Finalizing {pdf_name} failed with exception: {e}")
+            return
+        if summary is None:
+            return
+        
+        print(f"\n🎉 {pdf_name} COMPLETED:")
+        print(f"  📊 Tables: {summary['final_tables']}/{summary['expected_tables']}")
+        print(f"  📋 Chunks: {summary['chunks']}")
+        print(f"  ⏱️ Processing time: {summary['processing_time']:.2f}s")
+        print(f"  💾 Excel: {pdf_name}_extracted.xlsx")
+
     def get_pdf_page_count(self, pdf_path: Path) -> int:
         """Get the total number of pages in PDF"""
         try:
@@ -335,38 +523,39 @@ class GlobalChunkPoolConverter:
             
             logger.info(f"🔗 Combining {len(chunk_paths)} chunks for {pdf_name}...")
             
-            # Start with first chunk
-            import shutil
-            shutil.copy2(chunk_paths[0], output_path)
-            combined_doc = Document(str(output_path))
-            
-            total_tables = len(combined_doc.tables)
+            # Merge at the XML level: each chunk's body elements are moved (not deep-copied)
+            # into the first chunk's document.xml; the first chunk's other parts are kept as-is
+            with zipfile.ZipFile(chunk_paths[0]) as first_zip:
+                combined_root = parse_xml(first_zip.read(DOCUMENT_XML))
+            combined_body = combined_root.find(W_BODY)
+            # pdf2docx ends every page with a body-level sectPr; only the document's trailing
+            # one closes the body, so chunks go in ahead of it and after everything else
+            section = trailing_section(combined_body)
+            insert = combined_body.append if section is None else section.addprevious
             
             # Append remaining chunks
-            for i, chunk_path in enumerate(chunk_paths[1:], 1):
-                chunk_doc = Document(str(chunk_path))
-                chunk_tables = len(chunk_doc.tables)
-                
-                # Add page break
-                combined_doc.add_page_break()
-                
-                # Copy all elements from chunk
-                for element in chunk_doc.element.body:
-                    try:
-                        import copy
-                        imported = copy.deepcopy(element)
-                        combined_doc.element.body.append(imported)
-                    except:
-                        pass
+            for chunk_path in chunk_paths[1:]:
+                with zipfile.ZipFile(chunk_path) as chunk_zip:
+                    chunk_body = parse_xml(chunk_zip.read(DOCUMENT_XML)).find(W_BODY)
                 
-                total_tables += chunk_tables
+                # Page break, then the chunk's content with its per-page section breaks;
+                # only its trailing sectPr is dropped, the document keeps its own
+                insert(page_break_paragraph())
+                chunk_section = trailing_section(chunk_body)
+                for element in list(chunk_body):
+                    if element is not chunk_section:
+                        insert(element)
             
-            # Save combined document
-            combined_doc.save(str(output_path))
+            # Save combined document (compressed, unlike the chunk files it is built from)
+            document_xml = etree.tostring(combined_root, xml_declaration=True, encoding='UTF-8', standalone=True)
+            with zipfile.ZipFile(chunk_paths[0]) as first_zip, \
+                    zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as combined_zip:
+                for item in first_zip.infolist():
+                    data = document_xml if item.filename == DOCUMENT_XML else first_zip.read(item.filename)
+                    combined_zip.writestr(item, data, compress_type=zipfile.ZIP_DEFLATED)
             
-            # Verify result
-            verification_doc = Document(str(output_path))
-            final_count = len(verification_doc.tables)
+            # Verify result from the merged tree instead of reloading the saved file
+            final_count = len(combined_body.findall(W_TBL))
             
             logger.info(f"✅ {pdf_name}: Combined {len(chunk_paths)} chunks → {final_count} tables")
             return output_path
@@ -379,27 +568,27 @@ class GlobalChunkPoolConverter:
                 return output_path
             return None
 
-    def convert_docx_to_excel(self, docx_path: Path, source_type: str = "DOCX"):
-        """Convert DOCX tables to Excel sheets (same proven method)"""
+    def convert_docx_to_excel(self, docx_path: Path, source_type: str = "DOCX") -> Optional[int]:
+        """Convert DOCX tables to Excel sheets (same proven method), returning the table count"""
         try:
-            doc = Document(docx_path)
-            total_tables = len(doc.tables)
+            # Only the tables are needed, so document.xml is parsed without opening the whole package
+            tables = docx_tables(docx_path)
+            total_tables = len(tables)
             
             if total_tables == 0:
                 logger.warning(f"⚠️ No tables found in {docx_path.name}")
-                return
+                return 0
             
             extraction_start = time.time()
             
-            # Create Excel workbook
-            wb = Workbook()
-            wb.remove(wb.active)
+            # Create Excel workbook (write-only: rows are streamed, no in-memory cell grid)
+            wb = Workbook(write_only=True)
             
-            # Create summary sheet
+            # Create summary sheet first
             self.create_summary_sheet(wb, total_tables, docx_path.name, source_type)
             
             # Process each table
-            for table_index, table in enumerate(doc.tables):
+            for table_index, tbl in enumerate(tables):
                 page_number = (table_index // 4) + 1
                 table_position = table_index % 4
                 table_name = self.table_names[table_position]
@@ -407,7 +596,7 @@ class GlobalChunkPoolConverter:
                 sheet_name = f"P{page_number}_{table_name[:20]}"
                 ws = wb.create_sheet(title=sheet_name)
                 
-                self.copy_table_to_sheet(table, ws, docx_path.name, page_number, table_name)
+                self.copy_table_to_sheet(tbl, ws, docx_path.name, page_number, table_name)
                 
                 if (table_index + 1) % 40 == 0:
                     logger.info(f"📋 Processed {table_index + 1}/{total_tables} tables...")
@@ -419,67 +608,78 @@ class GlobalChunkPoolConverter:
             
             extraction_time = time.time() - extraction_start
             logger.info(f"📊 Excel extraction completed in {extraction_time:.2f} seconds")
+            return total_tables
             
         except Exception as e:
             logger.error(f"❌ Error processing {docx_path.name}: {e}")
 
-    def copy_table_to_sheet(self, table, ws, filename, page_number, table_name):
-        """Copy DOCX table to Excel worksheet (proven method)"""
-        ws['A1'] = f"Source: {filename}"
-        ws['A2'] = f"Page: {page_number}"
-        ws['A3'] = f"Table: {table_name}"
-        ws['A4'] = f"Rows: {len(table.rows)}"
-        ws['A5'] = f"Columns: {len(table.columns) if table.rows else 0}"
-        
-        start_row = 7
-        
-        for row_index, table_row in enumerate(table.rows):
-            excel_row = start_row + row_index
-            for col_index, cell in enumerate(table_row.cells):
-                excel_col = col_index + 1
-                cell_text = cell.text.strip()
-                ws.cell(row=excel_row, column=excel_col, value=cell_text)
-        
-        self.apply_basic_formatting(ws, start_row, len(table.rows))
-
-    def apply_basic_formatting(self, ws, start_row, num_rows):
-        """Apply basic formatting"""
-        for row in ws[1:5]:
-            for cell in row:
-                if cell.value:
-                    cell.font = Font(bold=True)
-        
-        if num_rows > 0:
-            for cell in ws[start_row]:
-                if cell.value:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+    def copy_table_to_sheet(self, tbl, ws, filename, page_number, table_name):
+        """Copy a DOCX <w:tbl> to Excel worksheet (proven method)"""
+        # Cell text comes straight from the XML rather than through python-docx's _Row/_Cell objects
+        table_data = list(table_rows_text(tbl))
+        metadata = [
+            f"Source: {filename}",
+            f"Page: {page_number}",
+            f"Table: {table_name}",
+            f"Rows: {len(table_data)}",
+            f"Columns: {len(tbl.tblGrid.gridCol_lst) if table_data else 0}",
+        ]
+        for line in metadata:
+            ws.append(self.bold_row(ws, [line]))
+        
+        # Table starts at row 7, one appended row per table row
+        ws.append([])
+        
+        for row_index, row_data in enumerate(table_data):
+            if row_index == 0:
+                # Header row: bold on a gray fill
+                ws.append(self.bold_row(ws, row_data, fill=_HEADER_FILL))
+            else:
+                ws.append(row_data)
+
+    def bold_row(self, ws, values, fill=None):
+        """Wrap row values in bold write-only cells (empty values stay unstyled)"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            if value:
+                cell.font = _BOLD
+                if fill is not None:
+                    cell.fill = fill
+            cells.append(cell)
+        return cells
 
     def create_summary_sheet(self, wb, total_tables, filename, source_type):
         """Create summary sheet with global pool info"""
-        ws = wb.create_sheet(title="Summary", index=0)
+        # Created before any table sheet, so it is the first sheet of the write-only workbook
+        ws = wb.create_sheet(title="Summary")
         
-        ws['A1'] = "🌐 Global Chunk Pool PDF→DOCX→Excel Converter"
-        ws['A1'].font = Font(size=16, bold=True)
-        
-        ws['A3'] = f"Source Type: {source_type}"
-        ws['A4'] = f"Source File: {filename}"
-        ws['A5'] = f"Total Tables: {total_tables}"
-        ws['A6'] = f"Chunk Size: {self.chunk_size} pages"
-        ws['A7'] = f"Max Workers: {self.max_workers}"
-        ws['A8'] = f"CPU Cores: {multiprocessing.cpu_count()}"
+        title = WriteOnlyCell(ws, value="🌐 Global Chunk Pool PDF→DOCX→Excel Converter")
+        title.font = _TITLE_FONT
+        ws.append([title])
+        ws.append([])
         
         total_pages = (total_tables + 3) // 4
-        ws['A9'] = f"Total Pages: {total_pages}"
-        ws['A10'] = f"Processing Method: Global chunk pool"
-        
-        ws['A12'] = "Global Pool Benefits:"
-        ws['A12'].font = Font(bold=True)
-        ws['A13'] = "🌐 Cross-PDF worker utilization"
-        ws['A14'] = "⚡ No idle worker time"
-        ws['A15'] = "🚀 Maximum efficiency"
-        ws['A16'] = "📊 Perfect table preservation"
-        ws['A17'] = "💾 Separate Excel per PDF"
+        summary_lines = [
+            f"Source Type: {source_type}",
+            f"Source File: {filename}",
+            f"Total Tables: {total_tables}",
+            f"Chunk Size: {self.chunk_size} pages",
+            f"Max Workers: {self.max_workers}",
+            f"CPU Cores: {multiprocessing.cpu_count()}",
+            f"Total Pages: {total_pages}",
+            f"Processing Method: Global chunk pool",
+        ]
+        for line in summary_lines:
+            ws.append([line])
+        ws.append([])
+        
+        ws.append(self.bold_row(ws, ["Global Pool Benefits:"]))
+        ws.append(["🌐 Cross-PDF worker utilization"])
+        ws.append(["⚡ No idle worker time"])
+        ws.append(["🚀 Maximum efficiency"])
+        ws.append(["📊 Perfect table preservation"])
+        ws.append(["💾 Separate Excel per PDF"])
 
     def cleanup_temp_files(self):
         """Clean up temporary chunk files"""